@@ -9,6 +9,7 @@ import logging
 import os
 import re
 import sqlite3
+import threading
 from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -75,7 +76,29 @@ def _get_db_path(tool_config: Optional[Dict[str, Any]]) -> str:
             return path
     return _DEFAULT_DB_PATH
 
+# Open connections reused across tool calls, keyed by (thread id, db path).
+# sqlite3 connections are bound to the thread that created them, so each
+# thread (event loop) gets its own; schema setup and pragmas run once per
+# connection instead of on every call.
+_CONN_CACHE: Dict[Tuple[int, str], sqlite3.Connection] = {}
+_CONN_CACHE_LOCK = threading.Lock()
+
+
 def _open_sqlite(db_path: str) -> sqlite3.Connection:
+    # Private in-memory DBs are per-connection, so never share them.
+    if db_path == ":memory:":
+        return _connect_sqlite(db_path)
+
+    key = (threading.get_ident(), db_path)
+    with _CONN_CACHE_LOCK:
+        conn = _CONN_CACHE.get(key)
+        if conn is None:
+            conn = _connect_sqlite(db_path)
+            _CONN_CACHE[key] = conn
+    return conn
+
+
+def _connect_sqlite(db_path: str) -> sqlite3.Connection:
     if db_path != ":memory:" and not db_path.startswith("file:"):
         db_dir = os.path.dirname(os.path.abspath(db_path))
         if db_dir:
@@ -83,9 +106,33 @@ def _open_sqlite(db_path: str) -> sqlite3.Connection:
 
     # Use a short timeout to avoid hanging on locked DBs.
     conn = sqlite3.connect(db_path, timeout=10, uri=db_path.startswith("file:"))
+    # WAL lets readers run alongside a writer and, with synchronous=NORMAL,
+    # commits no longer fsync the main DB file every time.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
     _ensure_inventory_schema(conn)
     return conn
 
+
+def _release_sqlite(conn: Optional[sqlite3.Connection]) -> None:
+    """Hand a connection back after a tool call.
+
+    Pooled connections stay open; anything the call left uncommitted (e.g. an
+    early error return) is rolled back so the next caller starts clean.
+    """
+    if conn is None:
+        return
+    try:
+        if conn in _CONN_CACHE.values():
+            if conn.in_transaction:
+                conn.rollback()
+        else:
+            conn.close()
+    except Exception:
+        pass
+
 def _ensure_inventory_schema(conn: sqlite3.Connection) -> None:
     cur = conn.cursor()
     cur.execute(
@@ -139,6 +186,19 @@ def _ensure_inventory_schema(conn: sqlite3.Connection) -> None:
         """
     )
 
+    # Name lookups (insert merge, stock updates, shopping-list dedupe) all
+    # filter on lower(trim(product_name)); expression indexes turn those full
+    # scans into index seeks. `id` is already the rowid, so the
+    # ORDER BY id DESC LIMIT listings walk the table b-tree without sorting.
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_inventory_name_norm "
+        "ON inventory(lower(trim(product_name)))"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_shopping_list_name_norm "
+        "ON shopping_list(lower(trim(product_name)))"
+    )
+
     conn.commit()
 
 
@@ -181,33 +241,34 @@ def _first_non_empty(item: Dict[str, Any], keys: List[str]) -> Optional[Any]:
     return None
 
 
+_UNIT_ALIASES: Dict[str, str] = {
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "gram": "g",
+    "grams": "g",
+    "liter": "L",
+    "liters": "L",
+    "litre": "L",
+    "litres": "L",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "millilitre": "ml",
+    "millilitres": "ml",
+    "piece": "unit",
+    "pieces": "unit",
+    "pcs": "unit",
+    "pc": "unit",
+    "each": "unit",
+    "ea": "unit",
+    "units": "unit",
+}
+
+
 def _canonicalize_unit_token(value: Optional[str]) -> Optional[str]:
     token = _normalize_text(value)
     if not token:
         return None
-    lower = token.lower()
-    aliases = {
-        "kilogram": "kg",
-        "kilograms": "kg",
-        "gram": "g",
-        "grams": "g",
-        "liter": "L",
-        "liters": "L",
-        "litre": "L",
-        "litres": "L",
-        "milliliter": "ml",
-        "milliliters": "ml",
-        "millilitre": "ml",
-        "millilitres": "ml",
-        "piece": "unit",
-        "pieces": "unit",
-        "pcs": "unit",
-        "pc": "unit",
-        "each": "unit",
-        "ea": "unit",
-        "units": "unit",
-    }
-    return aliases.get(lower, token)
+    return _UNIT_ALIASES.get(token.lower(), token)
 
 
 def _normalize_insert_item(item: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
@@ -269,24 +330,65 @@ def _normalize_insert_item(item: Any) -> Tuple[Optional[Dict[str, Any]], Optiona
     }, None
 
 
+# Statements used by the insert path. Kept as constants so every call hits
+# sqlite3's prepared-statement cache with the exact same SQL text.
+_FIND_INVENTORY_ROW_SQL = """
+    SELECT id, product_name, quantity, quantity_unit, unit, category, expires_at, created_at, updated_at
+    FROM inventory
+    WHERE lower(trim(product_name)) = lower(trim(?))
+      AND COALESCE(lower(trim(quantity_unit)), '') = COALESCE(lower(trim(?)), '')
+      AND COALESCE(lower(trim(unit)), '') = COALESCE(lower(trim(?)), '')
+    ORDER BY id DESC
+    LIMIT 1
+"""
+
+_UPDATE_INVENTORY_ROW_SQL = """
+    UPDATE inventory
+    SET quantity = ?,
+        quantity_unit = COALESCE(?, quantity_unit),
+        unit = COALESCE(?, unit),
+        category = COALESCE(?, category),
+        expires_at = COALESCE(?, expires_at),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+_INSERT_INVENTORY_SQL = """
+    INSERT INTO inventory (product_name, quantity, quantity_unit, unit, category, expires_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# SQLite's lower() only folds ASCII, so in-memory matching must do the same.
+_ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+)
+
+
+def _inventory_match_key(
+    product_name: str, quantity_unit: Optional[str], unit: Optional[str]
+) -> Tuple[str, str, str]:
+    """Python mirror of the WHERE clause in _FIND_INVENTORY_ROW_SQL."""
+    return (
+        product_name.strip(" ").translate(_ASCII_LOWER),
+        (quantity_unit or "").strip(" ").translate(_ASCII_LOWER),
+        (unit or "").strip(" ").translate(_ASCII_LOWER),
+    )
+
+
+def _merge_expiry(existing: Optional[str], incoming: Optional[str]) -> Optional[str]:
+    # Keep the earliest expiry date
+    if existing and incoming:
+        return min(existing, incoming)
+    return existing or incoming or None
+
+
 def _find_existing_inventory_row(
     cur: sqlite3.Cursor,
     product_name: str,
     quantity_unit: Optional[str],
     unit: Optional[str],
 ) -> Optional[sqlite3.Row]:
-    cur.execute(
-        """
-        SELECT id, product_name, quantity, quantity_unit, unit, category, expires_at, created_at, updated_at
-        FROM inventory
-        WHERE lower(trim(product_name)) = lower(trim(?))
-          AND COALESCE(lower(trim(quantity_unit)), '') = COALESCE(lower(trim(?)), '')
-          AND COALESCE(lower(trim(unit)), '') = COALESCE(lower(trim(?)), '')
-        ORDER BY id DESC
-        LIMIT 1
-        """,
-        (product_name, quantity_unit, unit),
-    )
+    cur.execute(_FIND_INVENTORY_ROW_SQL, (product_name, quantity_unit, unit))
     return cur.fetchone()
 
 
@@ -413,76 +515,80 @@ async def insert_inventory_items(
         increased = 0
         skipped = 0
         skipped_details: List[str] = []
-
-        for idx, raw_item in enumerate(items):
-            normalized_item, normalize_error = _normalize_insert_item(raw_item)
-            if normalize_error:
-                skipped += 1
-                skipped_details.append(f"index={idx}: {normalize_error}")
-                continue
-
-            product_name = normalized_item["product_name"]
-            quantity = normalized_item["quantity"]
-            quantity_unit = normalized_item["quantity_unit"]
-            unit = normalized_item["unit"]
-            category = normalized_item.get("category")
-            expires_at = normalized_item.get("expires_at")
-
-            existing = _find_existing_inventory_row(
-                cur=cur,
-                product_name=product_name,
-                quantity_unit=quantity_unit,
-                unit=unit,
-            )
-            if existing:
-                current_quantity = _parse_quantity(existing["quantity"], default=0.0)
-                new_quantity = current_quantity + quantity
-                # Keep the earliest expiry date
-                merged_expires = None
-                ex_existing = existing["expires_at"]
-                if ex_existing and expires_at:
-                    merged_expires = min(ex_existing, expires_at)
-                elif ex_existing:
-                    merged_expires = ex_existing
-                elif expires_at:
-                    merged_expires = expires_at
-                cur.execute(
-                    """
-                    UPDATE inventory
-                    SET quantity = ?,
-                        quantity_unit = COALESCE(?, quantity_unit),
-                        unit = COALESCE(?, unit),
-                        category = COALESCE(?, category),
-                        expires_at = COALESCE(?, expires_at),
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (new_quantity, quantity_unit, unit, category, merged_expires, existing["id"]),
+        # New rows are buffered (keyed like the lookup query) so duplicates
+        # within one batch still merge, then written with one executemany.
+        pending: Dict[Tuple[str, str, str], List[Any]] = {}
+
+        # One write transaction for the whole batch; IMMEDIATE takes the
+        # write lock up front instead of upgrading mid-batch.
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for idx, raw_item in enumerate(items):
+                normalized_item, normalize_error = _normalize_insert_item(raw_item)
+                if normalize_error:
+                    skipped += 1
+                    skipped_details.append(f"index={idx}: {normalize_error}")
+                    continue
+
+                product_name = normalized_item["product_name"]
+                quantity = normalized_item["quantity"]
+                quantity_unit = normalized_item["quantity_unit"]
+                unit = normalized_item["unit"]
+                category = normalized_item.get("category")
+                expires_at = normalized_item.get("expires_at")
+
+                existing = _find_existing_inventory_row(
+                    cur=cur,
+                    product_name=product_name,
+                    quantity_unit=quantity_unit,
+                    unit=unit,
                 )
-                increased += 1
-                continue
+                if existing:
+                    current_quantity = _parse_quantity(existing["quantity"], default=0.0)
+                    cur.execute(
+                        _UPDATE_INVENTORY_ROW_SQL,
+                        (
+                            current_quantity + quantity,
+                            quantity_unit,
+                            unit,
+                            category,
+                            _merge_expiry(existing["expires_at"], expires_at),
+                            existing["id"],
+                        ),
+                    )
+                    increased += 1
+                    continue
+
+                key = _inventory_match_key(product_name, quantity_unit, unit)
+                row = pending.get(key)
+                if row is not None:
+                    # Same merge rules as the UPDATE above, applied in memory.
+                    row[1] += quantity
+                    row[2] = quantity_unit or row[2]
+                    row[3] = unit or row[3]
+                    row[4] = category or row[4]
+                    row[5] = _merge_expiry(row[5], expires_at)
+                    increased += 1
+                    continue
+
+                # Auto-estimate expiry if not provided
+                if not expires_at:
+                    expires_at = _estimate_expiry(category or "Other")
+
+                pending[key] = [
+                    product_name, quantity, quantity_unit, unit, category or "Other", expires_at,
+                ]
+                inserted += 1
 
-            # Auto-estimate expiry if not provided
-            if not expires_at:
-                expires_at = _estimate_expiry(category or "Other")
+            if inserted == 0 and increased == 0:
+                details = "; ".join(skipped_details[:8]) if skipped_details else "No valid items."
+                return _error_response(
+                    "insert",
+                    f"No valid items to insert. {details}",
+                )
 
-            cur.execute(
-                """
-                INSERT INTO inventory (product_name, quantity, quantity_unit, unit, category, expires_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (product_name, quantity, quantity_unit, unit, category or "Other", expires_at),
-            )
-            inserted += 1
+            cur.executemany(_INSERT_INVENTORY_SQL, (tuple(row) for row in pending.values()))
 
-        if inserted == 0 and increased == 0:
-            details = "; ".join(skipped_details[:8]) if skipped_details else "No valid items."
-            return _error_response(
-                "insert",
-                f"No valid items to insert. {details}",
-            )
-
-        conn.commit()
         log.info(
             f"{log_id} Inserted {inserted}, increased {increased}, skipped {skipped}"
         )
@@ -501,10 +607,7 @@ async def insert_inventory_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("insert", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def increase_inventory_stock(
@@ -599,10 +702,7 @@ async def increase_inventory_stock(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("increase", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def decrease_inventory_stock(
@@ -708,10 +808,7 @@ async def decrease_inventory_stock(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("decrease", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def delete_inventory_item(
@@ -783,10 +880,7 @@ async def delete_inventory_item(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("delete", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def bulk_delete_inventory_items(
@@ -882,10 +976,7 @@ async def bulk_delete_inventory_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("bulk_delete", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 # ── Ingredient categories for recipe-aware inventory queries ───────
@@ -920,13 +1011,20 @@ RECIPE_CATEGORY_SHELF_LIFE_DAYS = {
 }
 
 
+# One alternation per category, tried in INGREDIENT_CATEGORIES order, so a
+# name is scanned once per category instead of once per keyword.
+_INGREDIENT_CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(re.escape(kw) for kw in keywords)))
+    for category, keywords in INGREDIENT_CATEGORIES.items()
+]
+
+
 def _categorize_ingredient(product_name: str) -> str:
     """Assign a food category to a product name via keyword matching."""
     name_lower = product_name.lower()
-    for category, keywords in INGREDIENT_CATEGORIES.items():
-        for kw in keywords:
-            if kw in name_lower:
-                return category
+    for category, pattern in _INGREDIENT_CATEGORY_PATTERNS:
+        if pattern.search(name_lower):
+            return category
     return "Other"
 
 
@@ -1040,10 +1138,7 @@ async def get_inventory_for_recipes(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("read", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 def _to_ml(amount: float, unit: str) -> Optional[float]:
@@ -1056,19 +1151,27 @@ def _to_g(amount: float, unit: str) -> Optional[float]:
     return amount * factor if factor is not None else None
 
 
-def _fuzzy_match_ingredient(inv_name: str, recipe_name: str) -> bool:
-    inv_lower = inv_name.lower()
-    rec_lower = recipe_name.lower()
+def _fuzzy_match_ingredient(
+    inv_lower: str,
+    inv_first_word: str,
+    rec_lower: str,
+    rec_first_word: str,
+    rec_long_words: List[str],
+) -> bool:
+    """Loosely match an inventory name against a recipe ingredient name.
+
+    Takes pre-lowercased names (plus first words and the recipe's 4+ letter
+    words) so one ingredient checked against every inventory row is only
+    normalized once.
+    """
     if inv_lower == rec_lower:
         return True
     if inv_lower in rec_lower or rec_lower in inv_lower:
         return True
-    inv_words = inv_lower.split()
-    rec_words = rec_lower.split()
-    if inv_words and rec_words and inv_words[0] == rec_words[0] and len(inv_words[0]) >= 4:
+    if inv_first_word and inv_first_word == rec_first_word and len(inv_first_word) >= 4:
         return True
-    for word in rec_words:
-        if len(word) >= 4 and word in inv_lower:
+    for word in rec_long_words:
+        if word in inv_lower:
             return True
     return False
 
@@ -1182,10 +1285,12 @@ async def get_ingredient_names(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("read", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
+
+
+# Hero ingredients first, then staples; see get_prioritized_ingredients.
+_PRIORITY_TIER1 = frozenset({"Meat", "Seafood", "Produce", "Dairy"})
+_PRIORITY_TIER2 = frozenset({"Grains", "Frozen", "Canned", "Snacks", "Other"})
 
 
 async def get_prioritized_ingredients(
@@ -1204,8 +1309,6 @@ async def get_prioritized_ingredients(
     if not db_path:
         return _error_response("read", "Missing db_path in tool_config.")
 
-    TIER1 = {"Meat", "Seafood", "Produce", "Dairy"}
-    TIER2 = {"Grains", "Frozen", "Canned", "Snacks", "Other"}
     excluded = {c.strip() for c in exclude_categories.split(",") if c.strip()}
 
     conn: Optional[sqlite3.Connection] = None
@@ -1228,9 +1331,9 @@ async def get_prioritized_ingredients(
             name = row["product_name"]
             if category in excluded:
                 continue
-            if category in TIER1:
+            if category in _PRIORITY_TIER1:
                 tier1_items.append(name)
-            elif category in TIER2 or category not in excluded:
+            elif category in _PRIORITY_TIER2 or category not in excluded:
                 tier2_items.append(name)
 
         # Cap: fill tier1 first, then tier2 up to max_ingredients
@@ -1262,10 +1365,7 @@ async def get_prioritized_ingredients(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("read", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def check_recipe_ingredient_sufficiency(
@@ -1312,17 +1412,15 @@ async def check_recipe_ingredient_sufficiency(
         log.error(f"{log_id} SQLite error: {e}", exc_info=True)
         return _error_response("read", f"SQLite error: {e}")
     finally:
-        if conn:
-            try:
-                conn.close()
-            except Exception:
-                pass
+        _release_sqlite(conn)
 
     # Build inventory lookup list
     inventory: List[Dict] = []
     for row in inv_rows:
+        name_lower = (row["product_name"] or "").strip().lower()
         inventory.append({
-            "name": (row["product_name"] or "").strip(),
+            "name_lower": name_lower,
+            "first_word": name_lower.split(None, 1)[0] if name_lower else "",
             "quantity": float(row["quantity"] or 0),
             "unit": (row["quantity_unit"] or row["unit"] or "").strip(),
         })
@@ -1338,9 +1436,16 @@ async def check_recipe_ingredient_sufficiency(
                 continue
 
             # Find matching inventory row
+            rec_lower = recipe_name.lower()
+            rec_words = rec_lower.split()
+            rec_first_word = rec_words[0] if rec_words else ""
+            rec_long_words = [word for word in rec_words if len(word) >= 4]
             match = None
             for inv in inventory:
-                if _fuzzy_match_ingredient(inv["name"], recipe_name):
+                if _fuzzy_match_ingredient(
+                    inv["name_lower"], inv["first_word"],
+                    rec_lower, rec_first_word, rec_long_words,
+                ):
                     match = inv
                     break
 
@@ -1387,6 +1492,21 @@ async def check_recipe_ingredient_sufficiency(
     }
 
 
+# Column order for the list/search queries; rows are zipped against these
+# directly instead of going through sqlite3.Row and dict(row).
+_INVENTORY_COLUMNS = (
+    "id", "product_name", "quantity", "quantity_unit", "unit",
+    "category", "expires_at", "created_at", "updated_at",
+)
+_INVENTORY_SELECT = ", ".join(_INVENTORY_COLUMNS)
+
+_SHOPPING_LIST_COLUMNS = (
+    "id", "product_name", "quantity", "quantity_unit", "unit",
+    "category", "checked", "created_at", "updated_at",
+)
+_SHOPPING_LIST_SELECT = ", ".join(_SHOPPING_LIST_COLUMNS)
+
+
 async def list_inventory_items(
     limit: int = 100,
     tool_context: Optional[Any] = None,
@@ -1403,18 +1523,18 @@ async def list_inventory_items(
     conn: Optional[sqlite3.Connection] = None
     try:
         conn = _open_sqlite(db_path)
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
+        cur.row_factory = None
         cur.execute(
-            """
-            SELECT id, product_name, quantity, quantity_unit, unit, category, expires_at, created_at, updated_at
+            f"""
+            SELECT {_INVENTORY_SELECT}
             FROM inventory
             ORDER BY id DESC
             LIMIT ?
             """,
             (limit,),
         )
-        rows = [dict(row) for row in cur.fetchall()]
+        rows = [dict(zip(_INVENTORY_COLUMNS, row)) for row in cur.fetchall()]
         log.info(f"{log_id} Retrieved {len(rows)} rows")
         return {"status": "success", "count": len(rows), "rows": rows}
     except sqlite3.Error as e:
@@ -1424,10 +1544,26 @@ async def list_inventory_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("read", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
+
+
+# sort_by key -> column, and the direction used when no _asc/_desc suffix is given.
+_SORT_COLUMNS: Dict[str, str] = {
+    "name": "product_name",
+    "quantity": "quantity",
+    "category": "category",
+    "expires_at": "expires_at",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+_SORT_DEFAULT_DIRECTIONS: Dict[str, str] = {
+    "name": "ASC",
+    "quantity": "DESC",
+    "category": "ASC",
+    "expires_at": "ASC",
+    "created_at": "DESC",
+    "updated_at": "DESC",
+}
 
 
 async def search_inventory_items(
@@ -1504,8 +1640,8 @@ async def search_inventory_items(
     conn: Optional[sqlite3.Connection] = None
     try:
         conn = _open_sqlite(db_path)
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
+        cur.row_factory = None
 
         conditions = []
         params = []
@@ -1565,23 +1701,6 @@ async def search_inventory_items(
             params.append(updated_before)
 
         # --- Sort ---
-        sort_column_map = {
-            "name": "product_name",
-            "quantity": "quantity",
-            "category": "category",
-            "expires_at": "expires_at",
-            "created_at": "created_at",
-            "updated_at": "updated_at",
-        }
-        default_directions = {
-            "name": "ASC",
-            "quantity": "DESC",
-            "category": "ASC",
-            "expires_at": "ASC",
-            "created_at": "DESC",
-            "updated_at": "DESC",
-        }
-
         order_clause = "created_at DESC"
         if sort_by:
             sort_lower = sort_by.strip().lower()
@@ -1595,10 +1714,10 @@ async def search_inventory_items(
             else:
                 sort_key = sort_lower
 
-            if sort_key in sort_column_map:
-                col = sort_column_map[sort_key]
+            col = _SORT_COLUMNS.get(sort_key)
+            if col:
                 if direction is None:
-                    direction = default_directions.get(sort_key, "ASC")
+                    direction = _SORT_DEFAULT_DIRECTIONS.get(sort_key, "ASC")
                 order_clause = f"{col} {direction}"
             else:
                 log.warning(f"{log_id} Unrecognized sort_by='{sort_by}', using default")
@@ -1611,8 +1730,7 @@ async def search_inventory_items(
         effective_limit = min(limit, 200)
 
         sql = f"""
-            SELECT id, product_name, quantity, quantity_unit, unit,
-                   category, expires_at, created_at, updated_at
+            SELECT {_INVENTORY_SELECT}
             FROM inventory
             WHERE {where}
             ORDER BY {order_clause}
@@ -1621,7 +1739,7 @@ async def search_inventory_items(
         params.append(effective_limit)
 
         cur.execute(sql, params)
-        rows = [dict(row) for row in cur.fetchall()]
+        rows = [dict(zip(_INVENTORY_COLUMNS, row)) for row in cur.fetchall()]
 
         filters_applied = {
             "query": query,
@@ -1654,10 +1772,7 @@ async def search_inventory_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("read", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 # ---------------------------------------------------------------------------
@@ -1679,19 +1794,18 @@ async def list_shopping_list_items(
     conn: Optional[sqlite3.Connection] = None
     try:
         conn = _open_sqlite(db_path)
-        conn.row_factory = sqlite3.Row
         cur = conn.cursor()
+        cur.row_factory = None
         cur.execute(
-            """
-            SELECT id, product_name, quantity, quantity_unit, unit, category,
-                   checked, created_at, updated_at
+            f"""
+            SELECT {_SHOPPING_LIST_SELECT}
             FROM shopping_list
             ORDER BY checked ASC, id DESC
             LIMIT ?
             """,
             (limit,),
         )
-        rows = [dict(row) for row in cur.fetchall()]
+        rows = [dict(zip(_SHOPPING_LIST_COLUMNS, row)) for row in cur.fetchall()]
         log.info(f"{log_id} Retrieved {len(rows)} shopping list rows")
         return {"status": "success", "count": len(rows), "rows": rows}
     except sqlite3.Error as e:
@@ -1701,10 +1815,7 @@ async def list_shopping_list_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("read", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def insert_shopping_list_items(
@@ -1799,10 +1910,7 @@ async def insert_shopping_list_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("insert", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def toggle_shopping_list_item(
@@ -1840,10 +1948,7 @@ async def toggle_shopping_list_item(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("update", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def delete_shopping_list_item(
@@ -1874,10 +1979,7 @@ async def delete_shopping_list_item(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("delete", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
 
 
 async def clear_checked_shopping_list_items(
@@ -1906,7 +2008,4 @@ async def clear_checked_shopping_list_items(
         log.error(f"{log_id} Unexpected error: {e}", exc_info=True)
         return _error_response("delete", f"Unexpected error: {e}")
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        _release_sqlite(conn)
@@ -27,6 +27,15 @@ import httpx
 
 log = logging.getLogger(__name__)
 
+# Precompiled patterns for the per-item code/quantity checks below
+_PLU_CODE_RE = re.compile(r"^\d{4,5}$")
+_UPC_CODE_RE = re.compile(r"^\d{12,13}$")
+_QUANTITY_STRING_RE = re.compile(r"^(\d+(?:[.,]\d+)?)\s*(fl\s*oz|[a-z]+)")
+_CODE_FENCE_OPEN_RE = re.compile(r"^```(?:json)?\s*")
+_CODE_FENCE_CLOSE_RE = re.compile(r"\s*```$")
+_JSON_WS_RE = re.compile(r"[ \t\n\r]*")
+_JSON_DECODER = json.JSONDecoder()
+
 # ---------------------------------------------------------------------------
 # Common PLU codes (4-5 digit produce codes)
 # ---------------------------------------------------------------------------
@@ -180,25 +189,31 @@ Return ONLY a JSON array of item objects. No markdown, no explanation, no conver
 def _recover_truncated_json_array(text: str) -> Optional[List[Dict[str, Any]]]:
     """Attempt to recover complete items from a truncated JSON array.
 
-    When max_tokens cuts the response mid-item, we find the last complete
-    object in the array and parse everything up to that point.
+    When max_tokens cuts the response mid-item, we keep every complete object
+    before the cut. Elements are decoded one after another with raw_decode, so
+    the text is parsed once instead of re-parsing a prefix per "}" candidate.
     """
-    # Find the last complete object boundary: "},\n  {" or "}\n]"
-    last_complete = text.rfind("}")
-    if last_complete == -1:
+    pos = _JSON_WS_RE.match(text).end()
+    if not text.startswith("[", pos):
         return None
-    # Try progressively shorter substrings ending at a "}"
-    for i in range(last_complete, 0, -1):
-        if text[i] != "}":
-            continue
-        candidate = text[:i + 1].rstrip().rstrip(",") + "\n]"
+    pos = _JSON_WS_RE.match(text, pos + 1).end()
+
+    items: List[Any] = []
+    while True:
         try:
-            parsed = json.loads(candidate)
-            if isinstance(parsed, list) and len(parsed) > 0:
-                return parsed
+            item, pos = _JSON_DECODER.raw_decode(text, pos)
         except json.JSONDecodeError:
-            continue
-    return None
+            break
+        items.append(item)
+        pos = _JSON_WS_RE.match(text, pos).end()
+        if not text.startswith(",", pos):
+            break
+        pos = _JSON_WS_RE.match(text, pos + 1).end()
+
+    # Only objects count as complete items; drop any trailing scalars/arrays.
+    while items and not isinstance(items[-1], dict):
+        items.pop()
+    return items or None
 
 
 # ---------------------------------------------------------------------------
@@ -250,8 +265,8 @@ async def _call_llm(
         return {"error": "Unexpected response from LLM."}
 
     text = content.strip()
-    text = re.sub(r"^```(?:json)?\s*", "", text)
-    text = re.sub(r"\s*```$", "", text)
+    text = _CODE_FENCE_OPEN_RE.sub("", text)
+    text = _CODE_FENCE_CLOSE_RE.sub("", text)
 
     try:
         parsed = json.loads(text)
@@ -342,6 +357,15 @@ async def enrich_product_codes(
     log_id = "[ReceiptScanner:enrich_product_codes]"
     log.info(f"{log_id} Enriching {len(items)} items")
 
+    # Resolve larger receipts' UPCs against Open Food Facts in one request
+    upc_codes = list(dict.fromkeys(
+        code for code in (str(item.get("product_code") or "").strip() for item in items)
+        if _UPC_CODE_RE.match(code)
+    ))
+    off_found: Optional[Dict[str, Dict[str, Any]]] = None
+    if len(upc_codes) >= _OFF_BULK_MIN_CODES:
+        off_found = await _bulk_lookup_off(upc_codes, log_id)
+
     enriched = 0
     for item in items:
         code = str(item.get("product_code") or "").strip()
@@ -349,7 +373,7 @@ async def enrich_product_codes(
             continue
 
         # PLU codes: 4-5 digits
-        if re.match(r"^\d{4,5}$", code):
+        if _PLU_CODE_RE.match(code):
             plu_name = PLU_TABLE.get(code)
             if plu_name:
                 log.debug(f"{log_id} PLU {code} -> {plu_name}")
@@ -358,8 +382,11 @@ async def enrich_product_codes(
             continue
 
         # UPC codes: 12-13 digits
-        if re.match(r"^\d{12,13}$", code):
-            lookup = await _lookup_upc(code, log_id)
+        if _UPC_CODE_RE.match(code):
+            if off_found is None:
+                lookup = await _lookup_upc(code, log_id)
+            else:
+                lookup = off_found.get(code) or await _lookup_upc(code, log_id, try_off=False)
             if lookup:
                 item["product_name"] = lookup["name"]
                 # Apply package size if the vision LLM didn't already extract it
@@ -405,20 +432,110 @@ def _map_off_category(categories_str: str) -> str:
     return "Other"
 
 
-async def _lookup_upc(code: str, log_id: str) -> Optional[Dict[str, Any]]:
+def _upc_variants(code: str) -> List[str]:
+    """The raw code plus its 12/13-digit (UPC-A/EAN-13) counterpart."""
+    variants = [code]
+    if len(code) == 12:
+        variants.append("0" + code)
+    elif len(code) == 13 and code.startswith("0"):
+        variants.append(code[1:])
+    return variants
+
+
+def _off_product_to_result(product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert an Open Food Facts product record into our lookup result."""
+    name = product.get("product_name") or product.get("product_name_en")
+    if not name or len(name) <= 1:
+        return None
+    result: Dict[str, Any] = {"name": name}
+    # Brand
+    brand = product.get("brands", "")
+    if brand:
+        result["brand"] = brand.split(",")[0].strip()
+    # Image
+    img = product.get("image_front_small_url") or product.get("image_front_url")
+    if img:
+        result["image_url"] = img
+    # Category
+    cats = product.get("categories", "")
+    if cats:
+        result["category"] = _map_off_category(cats)
+    # Package size
+    qty_str = product.get("quantity", "")
+    if qty_str:
+        parsed = _parse_quantity_string(qty_str)
+        if parsed:
+            result["quantity_value"] = parsed[0]
+            result["quantity_unit"] = parsed[1]
+    # Serving size fallback for quantity
+    if "quantity_value" not in result:
+        srv = product.get("serving_size", "")
+        if srv:
+            parsed = _parse_quantity_string(srv.split("(")[-1].rstrip(")"))
+            if parsed:
+                result["quantity_value"] = parsed[0]
+                result["quantity_unit"] = parsed[1]
+    return result
+
+
+# With at least this many UPCs, enrich_product_codes asks Open Food Facts for
+# all of them in one search request instead of one product request per code.
+_OFF_BULK_MIN_CODES = 4
+_OFF_FIELDS = (
+    "code,product_name,product_name_en,brands,image_front_small_url,"
+    "image_front_url,categories,quantity,serving_size"
+)
+
+
+async def _bulk_lookup_off(codes: List[str], log_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Look up many UPCs (and their 12/13-digit variants) in one OFF search.
+
+    Returns {code: result} for the codes OFF knows about, or None if the
+    request failed (callers then fall back to per-code lookups).
+    """
+    variants = list(dict.fromkeys(v for code in codes for v in _upc_variants(code)))
+    try:
+        async with httpx.AsyncClient(timeout=15.0) as client:
+            resp = await client.get(
+                "https://world.openfoodfacts.org/api/v2/search",
+                params={"code": ",".join(variants), "fields": _OFF_FIELDS, "page_size": str(len(variants))},
+                headers={"User-Agent": "SmartAppetiteManager/1.0"},
+            )
+            resp.raise_for_status()
+            products = resp.json().get("products", [])
+    except Exception as e:
+        log.debug(f"{log_id} OFF bulk lookup failed for {len(codes)} codes: {e}")
+        return None
+
+    by_variant: Dict[str, Dict[str, Any]] = {}
+    for product in products:
+        result = _off_product_to_result(product)
+        if result and product.get("code"):
+            by_variant.setdefault(str(product["code"]), result)
+
+    found: Dict[str, Dict[str, Any]] = {}
+    for code in codes:
+        for upc in _upc_variants(code):
+            if upc in by_variant:
+                found[code] = by_variant[upc]
+                break
+    log.debug(f"{log_id} OFF bulk lookup matched {len(found)}/{len(codes)} codes")
+    return found
+
+
+async def _lookup_upc(code: str, log_id: str, try_off: bool = True) -> Optional[Dict[str, Any]]:
     """Look up a UPC code via Open Food Facts, then fallback to UPCitemdb.
 
+    Pass ``try_off=False`` when Open Food Facts was already asked (e.g. by
+    ``_bulk_lookup_off``) to go straight to the UPCitemdb fallback.
+
     Returns a dict with product info or None if not found.
     """
     # Try both the raw code and zero-padded to 13 digits (EAN format)
-    codes_to_try = [code]
-    if len(code) == 12:
-        codes_to_try.append("0" + code)
-    elif len(code) == 13 and code.startswith("0"):
-        codes_to_try.append(code[1:])
+    codes_to_try = _upc_variants(code)
 
     # Try Open Food Facts first (free, no key)
-    for upc in codes_to_try:
+    for upc in codes_to_try if try_off else []:
         try:
             async with httpx.AsyncClient(timeout=8.0) as client:
                 resp = await client.get(
@@ -428,37 +545,8 @@ async def _lookup_upc(code: str, log_id: str) -> Optional[Dict[str, Any]]:
                 if resp.status_code == 200:
                     data = resp.json()
                     if data.get("status") == 1:
-                        product = data.get("product", {})
-                        name = product.get("product_name") or product.get("product_name_en")
-                        if name and len(name) > 1:
-                            result: Dict[str, Any] = {"name": name}
-                            # Brand
-                            brand = product.get("brands", "")
-                            if brand:
-                                result["brand"] = brand.split(",")[0].strip()
-                            # Image
-                            img = product.get("image_front_small_url") or product.get("image_front_url")
-                            if img:
-                                result["image_url"] = img
-                            # Category
-                            cats = product.get("categories", "")
-                            if cats:
-                                result["category"] = _map_off_category(cats)
-                            # Package size
-                            qty_str = product.get("quantity", "")
-                            if qty_str:
-                                parsed = _parse_quantity_string(qty_str)
-                                if parsed:
-                                    result["quantity_value"] = parsed[0]
-                                    result["quantity_unit"] = parsed[1]
-                            # Serving size fallback for quantity
-                            if "quantity_value" not in result:
-                                srv = product.get("serving_size", "")
-                                if srv:
-                                    parsed = _parse_quantity_string(srv.split("(")[-1].rstrip(")"))
-                                    if parsed:
-                                        result["quantity_value"] = parsed[0]
-                                        result["quantity_unit"] = parsed[1]
+                        result = _off_product_to_result(data.get("product", {}))
+                        if result:
                             log.debug(f"{log_id} OFF {upc} -> {result}")
                             return result
         except Exception as e:
@@ -512,7 +600,7 @@ def _parse_quantity_string(qty_str: str) -> Optional[tuple]:
     """
     qty_str = qty_str.strip().lower()
     # Match patterns like "725 g", "1.5 kg", "500ml", "18 fl oz"
-    m = re.match(r"^(\d+(?:[.,]\d+)?)\s*(fl\s*oz|[a-z]+)", qty_str)
+    m = _QUANTITY_STRING_RE.match(qty_str)
     if not m:
         return None
     value_str = m.group(1).replace(",", ".")
@@ -542,7 +630,7 @@ async def lookup_barcode(code: str) -> Dict[str, Any]:
         return {"status": "error", "message": "No barcode code provided."}
 
     # PLU codes: 4-5 digits
-    if re.match(r"^\d{4,5}$", code):
+    if _PLU_CODE_RE.match(code):
         plu_name = PLU_TABLE.get(code)
         if plu_name:
             log.info(f"{log_id} PLU match -> {plu_name}")
@@ -558,7 +646,7 @@ async def lookup_barcode(code: str) -> Dict[str, Any]:
         return {"status": "not_found", "message": f"PLU code {code} not in lookup table.", "code": code}
 
     # UPC codes: 12-13 digits
-    if re.match(r"^\d{12,13}$", code):
+    if _UPC_CODE_RE.match(code):
         result = await _lookup_upc(code, log_id)
         if result:
             log.info(f"{log_id} UPC match -> {result['name']}")
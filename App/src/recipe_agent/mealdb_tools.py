@@ -1,16 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import os
-import urllib.error
 import urllib.parse
-import urllib.request
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import httpx
 from dotenv import load_dotenv
 
+from shopper_agent.http_utils import LoopLocal, TTLCache
+
 _ENV_PATH = Path(__file__).resolve().parents[2] / ".env"
 if _ENV_PATH.exists():
     load_dotenv(dotenv_path=_ENV_PATH)
@@ -23,79 +25,102 @@ class SpoonacularError(RuntimeError):
     """Raised when Spoonacular request setup/call fails."""
 
 
+# Resolved once per process; a missing key is re-checked on every call.
+_API_KEY: Optional[str] = None
+
+
 def _get_api_key() -> str:
+    global _API_KEY
+    if _API_KEY:
+        return _API_KEY
     key = (os.environ.get("SPOONACULAR_API_KEY") or "").strip()
     if not key:
         raise SpoonacularError(
             "SPOONACULAR_API_KEY is missing. Set it in App/.env and restart SAM."
         )
+    _API_KEY = key
     return key
 
 
+# In-process cache for GET responses, keyed by url.
+# Recipe details barely change, so they are kept for a day; searches only
+# briefly; random results are never cached. Cached payloads are shared between
+# callers, so treat anything returned by _fetch_json as read-only and copy any
+# list or dict from it before putting it into a tool result.
+_FETCH_CACHE = TTLCache(max_entries=512)
+_CACHE_MISS = object()
+_DETAIL_CACHE_TTL_S = 86400.0
+_SEARCH_CACHE_TTL_S = 300.0
+
+
+def _cache_ttl(url: str) -> Optional[float]:
+    split = urllib.parse.urlsplit(url)
+    path = split.path
+    if path.endswith("/random"):
+        return None
+    if ("sort", "random") in urllib.parse.parse_qsl(split.query):
+        # complex_search(sort_by="random") should not replay the same page.
+        return None
+    if path.endswith(("/information", "/informationBulk", "/analyzedInstructions")):
+        return _DETAIL_CACHE_TTL_S
+    return _SEARCH_CACHE_TTL_S
+
+
 async def _fetch_json(url: str) -> Any:
-    def _blocking() -> Any:
-        req = urllib.request.Request(url, headers={"User-Agent": "SmartAppetiteManager/1.0"})
-        try:
-            with urllib.request.urlopen(req, timeout=20) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            body = ""
-            try:
-                body = e.read().decode("utf-8", errors="replace")
-            except Exception:
-                pass
-            snippet = body[:500] if body else ""
-            raise SpoonacularError(
-                f"Spoonacular HTTP {e.code}. {snippet or 'No response body.'}"
-            ) from e
-        except urllib.error.URLError as e:
-            reason = getattr(e, "reason", e)
-            raise SpoonacularError(
-                f"Network error calling Spoonacular: {reason}"
-            ) from e
-        except json.JSONDecodeError as e:
-            raise SpoonacularError(
-                f"Invalid JSON from Spoonacular: {e}"
-            ) from e
-    return await asyncio.to_thread(_blocking)
+    ttl = _cache_ttl(url)
+    if ttl is not None:
+        cached = _FETCH_CACHE.get(url, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached
+
+    data = await _request_json("GET", url)
+
+    if ttl is not None:
+        _FETCH_CACHE.set(url, data, ttl)
+    return data
 
 
 async def _post_form(url: str, data: Dict[str, str]) -> Any:
     """POST with application/x-www-form-urlencoded (needed for parseIngredients)."""
-    def _blocking() -> Any:
-        encoded = urllib.parse.urlencode(data).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=encoded,
-            headers={
-                "User-Agent": "SmartAppetiteManager/1.0",
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
-            method="POST",
+    return await _request_json("POST", url, data=data)
+
+
+# Pooled HTTP clients, one per event loop (an httpx client is bound to the
+# loop it was first used on). Reusing it keeps the TLS connection to
+# Spoonacular alive between calls instead of handshaking every request.
+_HTTP_CLIENTS: LoopLocal[httpx.AsyncClient] = LoopLocal(
+    lambda: httpx.AsyncClient(
+        timeout=20,
+        follow_redirects=True,
+        headers={"User-Agent": "SmartAppetiteManager/1.0"},
+        limits=httpx.Limits(max_keepalive_connections=20),
+    ),
+    is_stale=lambda client: client.is_closed,
+)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    return _HTTP_CLIENTS.get()
+
+
+async def _request_json(method: str, url: str, **kwargs: Any) -> Any:
+    try:
+        resp = await _get_http_client().request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        raise SpoonacularError(
+            f"Network error calling Spoonacular: {e}"
+        ) from e
+    if resp.status_code >= 400:
+        snippet = resp.text[:500] if resp.content else ""
+        raise SpoonacularError(
+            f"Spoonacular HTTP {resp.status_code}. {snippet or 'No response body.'}"
         )
-        try:
-            with urllib.request.urlopen(req, timeout=20) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            body = ""
-            try:
-                body = e.read().decode("utf-8", errors="replace")
-            except Exception:
-                pass
-            snippet = body[:500] if body else ""
-            raise SpoonacularError(
-                f"Spoonacular HTTP {e.code}. {snippet or 'No response body.'}"
-            ) from e
-        except urllib.error.URLError as e:
-            reason = getattr(e, "reason", e)
-            raise SpoonacularError(
-                f"Network error calling Spoonacular: {reason}"
-            ) from e
-        except json.JSONDecodeError as e:
-            raise SpoonacularError(
-                f"Invalid JSON from Spoonacular: {e}"
-            ) from e
-    return await asyncio.to_thread(_blocking)
+    try:
+        return json.loads(resp.content)
+    except json.JSONDecodeError as e:
+        raise SpoonacularError(
+            f"Invalid JSON from Spoonacular: {e}"
+        ) from e
 
 
 # ── Private helpers ─────────────────────────────────────────────────
@@ -127,6 +152,19 @@ async def _get_random_fallback(number: int = 5) -> List[Dict]:
     return []
 
 
+# Agents sometimes hand over ingredient lists separated by ';', '|' or
+# newlines instead of commas; fold them all into ',' in one pass.
+_INGREDIENT_DELIMS = str.maketrans({";": ",", "|": ",", "\n": ","})
+
+
+def _split_ingredients(text: str) -> List[str]:
+    """Split a free-form ingredient list into lowercased, non-empty names."""
+    if not text:
+        return []
+    parts = (part.strip().lower() for part in text.translate(_INGREDIENT_DELIMS).split(","))
+    return [part for part in parts if part]
+
+
 # ── Scoring model ───────────────────────────────────────────────────
 
 
@@ -199,33 +237,38 @@ def _compute_scores(
     }
 
 
+def _fmt_ingredient(ing: Dict) -> Dict:
+    """Structured ingredient entry (name, display measure, numeric amount, unit)."""
+    raw_amount = ing.get("amount", "")
+    raw_unit = ing.get("unit", "")
+    return {
+        "ingredient": ing.get("name", ""),
+        "measure": f"{raw_amount} {raw_unit}".strip(),
+        "amount": float(raw_amount) if raw_amount != "" else None,
+        "unit": str(raw_unit) if raw_unit else "",
+    }
+
+
+def _fmt_ingredients(ings: Optional[List[Dict]]) -> List[Dict]:
+    return [_fmt_ingredient(ing) for ing in ings] if ings else []
+
+
+def _measured_ingredients(meal: Dict) -> List[Dict]:
+    """Compact ingredient/measure pairs used by the meal detail tools."""
+    return [
+        {"ingredient": ing.get("name"), "measure": f"{ing.get('amount')} {ing.get('unit')}"}
+        for ing in meal.get("extendedIngredients") or ()
+    ]
+
+
 def _normalize_recipe(raw: Dict, scores: Optional[Dict] = None) -> Dict[str, Any]:
     """Standardize a recipe dict from any Spoonacular endpoint."""
     used_ings = raw.get("usedIngredients", [])
     missed_ings = raw.get("missedIngredients", [])
 
-    def _fmt_ing(ing: Dict) -> Dict:
-        raw_amount = ing.get("amount", "")
-        raw_unit = ing.get("unit", "")
-        return {
-            "ingredient": ing.get("name", ""),
-            "measure": f"{raw_amount} {raw_unit}".strip(),
-            "amount": float(raw_amount) if raw_amount != "" else None,
-            "unit": str(raw_unit) if raw_unit else "",
-        }
-
     # Extract full ingredient list from extendedIngredients (available when
     # addRecipeInformation=true or from /information endpoint)
-    ext_ings = raw.get("extendedIngredients", [])
-    ingredients = [
-        {
-            "ingredient": ing.get("name", ""),
-            "measure": f"{ing.get('amount', '')} {ing.get('unit', '')}".strip(),
-            "amount": float(ing.get("amount", "")) if ing.get("amount", "") != "" else None,
-            "unit": str(ing.get("unit", "")) if ing.get("unit", "") else "",
-        }
-        for ing in ext_ings
-    ] if ext_ings else []
+    ingredients = _fmt_ingredients(raw.get("extendedIngredients", []))
 
     instructions = (raw.get("instructions") or "").strip()
 
@@ -236,12 +279,12 @@ def _normalize_recipe(raw: Dict, scores: Optional[Dict] = None) -> Dict[str, Any
         "readyInMinutes": raw.get("readyInMinutes", 0),
         "servings": raw.get("servings", 0),
         "sourceUrl": raw.get("sourceUrl", ""),
-        "usedIngredients": [_fmt_ing(i) for i in used_ings] if used_ings else [],
-        "missedIngredients": [_fmt_ing(i) for i in missed_ings] if missed_ings else [],
+        "usedIngredients": _fmt_ingredients(used_ings),
+        "missedIngredients": _fmt_ingredients(missed_ings),
         "usedIngredientCount": raw.get("usedIngredientCount", len(used_ings)),
         "missedIngredientCount": raw.get("missedIngredientCount", len(missed_ings)),
-        "diets": raw.get("diets", []),
-        "cuisines": raw.get("cuisines", []),
+        "diets": list(raw.get("diets") or ()),
+        "cuisines": list(raw.get("cuisines") or ()),
         "ingredients": ingredients,
         "instructions": instructions,
         "scores": scores,
@@ -282,6 +325,10 @@ async def complex_search(
     except SpoonacularError as e:
         return {"status": "error", "message": str(e)}
 
+    # Normalize once so Spoonacular searches the same ingredients we score by
+    pantry_list = _split_ingredients(ingredients)
+    ingredients_csv = ",".join(pantry_list)
+
     params: Dict[str, Any] = {
         "apiKey": api_key,
         "number": number,
@@ -293,8 +340,8 @@ async def complex_search(
     }
     if query:
         params["query"] = query
-    if ingredients:
-        params["includeIngredients"] = ingredients
+    if ingredients_csv:
+        params["includeIngredients"] = ingredients_csv
     if exclude_ingredients:
         params["excludeIngredients"] = exclude_ingredients
     if diet:
@@ -323,10 +370,10 @@ async def complex_search(
         results_raw = []
 
     # Fallback chain
-    if not results_raw and ingredients:
+    if not results_raw and ingredients_csv:
         fallback_used = "findByIngredients"
         try:
-            results_raw = await _find_by_ingredients_raw(ingredients, number)
+            results_raw = await _find_by_ingredients_raw(ingredients_csv, number)
         except SpoonacularError:
             results_raw = []
 
@@ -340,8 +387,6 @@ async def complex_search(
     if not results_raw:
         return {"status": "error", "message": "No recipes found after all search strategies."}
 
-    pantry_list = [i.strip().lower() for i in ingredients.split(",") if i.strip()] if ingredients else []
-
     recipes = []
     for raw in results_raw:
         scores = _compute_scores(
@@ -367,22 +412,25 @@ async def get_top_3_meals(
     ingredients: str,
     number: int = 3,
     pantry_ingredients: str = "",
+    include_details: bool = False,
     tool_context: Any = None,
 ) -> Dict[str, Any]:
     """
     Get the top N meals with the most used ingredients from Spoonacular.
     Results are scored and sorted by final_score.
+    With include_details=True, each meal also carries a "details" entry
+    (ingredients, instructions, analyzed steps) fetched concurrently.
     """
+    pantry_list = _split_ingredients(ingredients)
+
     try:
-        raw_list = await _find_by_ingredients_raw(ingredients, max(number * 3, 10))
+        raw_list = await _find_by_ingredients_raw(",".join(pantry_list), max(number * 3, 10))
     except SpoonacularError as e:
         return {"status": "error", "message": str(e)}
 
     if not raw_list:
         return {"status": "error", "message": "No meals found with the given ingredients."}
 
-    pantry_list = [i.strip().lower() for i in ingredients.split(",") if i.strip()]
-
     scored = []
     for meal in raw_list:
         scores = _compute_scores(meal, pantry_list)
@@ -409,6 +457,14 @@ async def get_top_3_meals(
         }
         results.append(entry)
 
+    if include_details and results:
+        details = await asyncio.gather(
+            *(get_meal_details(entry["idMeal"]) for entry in results)
+        )
+        for entry, detail in zip(results, details):
+            if detail.get("status") == "success":
+                entry["details"] = detail["meal"]
+
     return {"status": "success", "count": len(results), "meals": results}
 
 
@@ -471,20 +527,16 @@ async def get_meal_details_bulk(
 
     meals = []
     for meal in data:
-        ingredients = [
-            {"ingredient": ing.get("name"), "measure": f"{ing.get('amount')} {ing.get('unit')}"}
-            for ing in meal.get("extendedIngredients", [])
-        ]
         meals.append({
             "idMeal": str(meal.get("id")),
             "name": meal.get("title"),
             "image": meal.get("image", ""),
             "instructions": (meal.get("instructions") or "").strip(),
-            "ingredients": ingredients,
+            "ingredients": _measured_ingredients(meal),
             "readyInMinutes": meal.get("readyInMinutes", 0),
             "servings": meal.get("servings", 0),
-            "diets": meal.get("diets", []),
-            "cuisines": meal.get("cuisines", []),
+            "diets": list(meal.get("diets") or ()),
+            "cuisines": list(meal.get("cuisines") or ()),
             "sourceUrl": meal.get("sourceUrl", ""),
         })
 
@@ -523,10 +575,7 @@ async def get_meal_details(
         return {"status": "error", "message": f"No meal found for id={meal_id}"}
 
     meal = data
-    ingredients = [
-        {"ingredient": ing.get("name"), "measure": f"{ing.get('amount')} {ing.get('unit')}"}
-        for ing in meal.get("extendedIngredients", [])
-    ]
+    ingredients = _measured_ingredients(meal)
 
     return {
         "status": "success",
@@ -535,11 +584,11 @@ async def get_meal_details(
             "name": meal.get("title"),
             "instructions": (meal.get("instructions") or "").strip(),
             "ingredients": ingredients,
-            "analyzedInstructions": analyzed if isinstance(analyzed, list) else [],
+            "analyzedInstructions": copy.deepcopy(analyzed) if isinstance(analyzed, list) else [],
             "readyInMinutes": meal.get("readyInMinutes", 0),
             "servings": meal.get("servings", 0),
-            "diets": meal.get("diets", []),
-            "cuisines": meal.get("cuisines", []),
+            "diets": list(meal.get("diets") or ()),
+            "cuisines": list(meal.get("cuisines") or ()),
             "sourceUrl": meal.get("sourceUrl", ""),
         },
     }
@@ -571,7 +620,7 @@ async def get_random_meal(
         return {"status": "error", "message": "No random meal returned from Spoonacular"}
 
     meal = data["recipes"][0]
-    ingredients = [{"ingredient": ing.get("name"), "measure": f"{ing.get('amount')} {ing.get('unit')}"} for ing in meal.get("extendedIngredients", [])]
+    ingredients = _measured_ingredients(meal)
 
     return {
         "status": "success",
@@ -705,6 +754,6 @@ async def get_substitutes(
     return {
         "status": "success",
         "ingredient": ingredient_name,
-        "substitutes": data.get("substitutes", []),
+        "substitutes": list(data.get("substitutes") or ()),
         "message": data.get("message", ""),
     }
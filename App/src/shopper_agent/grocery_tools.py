@@ -1,9 +1,15 @@
 import asyncio
 import logging
 import os
+import random
 import re
+import urllib.parse
 import httpx
-from typing import Any, Dict, Optional, List, Tuple
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, List, Tuple
+
+from .http_utils import LoopLocal, TTLCache
 
 
 log = logging.getLogger(__name__)
@@ -11,15 +17,119 @@ log = logging.getLogger(__name__)
 FLIPP_SEARCH_URL = "https://backflipp.wishabi.com/flipp/items/search"
 OVERPASS_API_URL = "https://overpass-api.de/api/interpreter"
 
-# In-memory cache for Overpass store lookups
-_overpass_cache: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+# Flipp location defaults when tool_config does not set them (Ottawa)
+_DEFAULT_POSTAL_CODE = "K1A 0A6"
+_DEFAULT_LOCALE = "en-us"
+
+# Identifies us to the OpenStreetMap services (Overpass, Nominatim)
+_OSM_HEADERS = {"User-Agent": "SmartAppetiteManager/1.0 (hackathon project)"}
+
+# In-memory cache for Overpass store lookups: "store|lat,lng|radius" -> locations.
+# Keyed per store so overlapping batches reuse each other's results. Only
+# non-empty results are kept, and only from responses under the element cap.
+_overpass_cache = TTLCache(max_entries=512)
+_OVERPASS_CACHE_TTL_S = 6 * 3600.0
+_OVERPASS_MAX_ELEMENTS = 50
+
+# Pooled HTTP clients shared by the Flipp/Overpass/OCR calls, one per event
+# loop (an httpx client is bound to the loop it was first used on). Keeping
+# connections alive across tool calls skips a TCP+TLS handshake per request.
+_http_clients: LoopLocal[httpx.AsyncClient] = LoopLocal(
+    lambda: httpx.AsyncClient(
+        timeout=15.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    ),
+    is_stale=lambda client: client.is_closed,
+)
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    return _http_clients.get()
+
+
+# Upper bound on in-flight Flipp searches across every tool in the process,
+# however many gather() fan-outs are running at once.
+_FLIPP_MAX_CONCURRENT = int(os.getenv("FLIPP_MAX_CONCURRENT", "10"))
+
+# asyncio.Semaphore binds to the loop it is first used on, so keep one per loop
+_flipp_semaphores: LoopLocal[asyncio.Semaphore] = LoopLocal(
+    lambda: asyncio.Semaphore(_FLIPP_MAX_CONCURRENT)
+)
+
+
+# Short-lived cache of Flipp results: (locale, postal_code, query, ...) ->
+# {"items": [...], "ecom_items": [...]}. Users tend to re-plan the same list
+# within minutes. Only the two lists callers read are kept, since a full
+# payload is much larger. They are shared between callers, so treat them as
+# read-only.
+_flipp_cache = TTLCache(max_entries=128)
+_FLIPP_CACHE_TTL_S = 300.0
+
+# Transient Flipp failures (rate limiting, gateway hiccups) are retried with
+# jittered exponential backoff before surfacing as an error.
+_FLIPP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_FLIPP_MAX_TRIES = 3
+_FLIPP_BACKOFF_BASE_S = 0.4
+
+
+def _flipp_cache_key(params: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted(
+        (k, v.strip().lower() if k == "q" else v) for k, v in params.items()
+    ))
+
+
+def _flipp_params_base(tool_config: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Location params shared by every Flipp search; callers add ``q``."""
+    return {
+        "locale": (tool_config.get("locale") if tool_config else None) or _DEFAULT_LOCALE,
+        "postal_code": (tool_config.get("postal_code") if tool_config else None) or _DEFAULT_POSTAL_CODE,
+    }
+
+
+@lru_cache(maxsize=64)
+def _flipp_base_url(static_params: Tuple[Tuple[str, str], ...]) -> str:
+    """Search URL with the per-batch params (locale, postal code) already encoded."""
+    return f"{FLIPP_SEARCH_URL}?{urllib.parse.urlencode(static_params)}"
+
+
+def _flipp_search_url(params: Dict[str, str]) -> str:
+    static_params = tuple((k, v) for k, v in params.items() if k != "q")
+    url = _flipp_base_url(static_params)
+    if "q" in params:
+        url += ("&q=" if static_params else "q=") + urllib.parse.quote_plus(params["q"])
+    return url
 
-_NON_GROCERY_KEYWORDS = {
+
+async def _flipp_search(params: Dict[str, str]) -> Dict[str, Any]:
+    """Run one Flipp search (bounded by the shared limit) and return its item lists."""
+    key = _flipp_cache_key(params)
+    cached = _flipp_cache.get(key)
+    if cached is not None:
+        return cached
+
+    for attempt in range(_FLIPP_MAX_TRIES):
+        async with _flipp_semaphores.get():
+            resp = await _get_http_client().get(_flipp_search_url(params))
+        if resp.status_code not in _FLIPP_RETRY_STATUSES or attempt == _FLIPP_MAX_TRIES - 1:
+            break
+        # Back off outside the semaphore so other searches keep moving.
+        await asyncio.sleep(_FLIPP_BACKOFF_BASE_S * 2 ** attempt + random.random() * 0.1)
+    resp.raise_for_status()
+    payload = resp.json()
+
+    data = {
+        "items": payload.get("items") or [],
+        "ecom_items": payload.get("ecom_items") or [],
+    }
+    _flipp_cache.set(key, data, _FLIPP_CACHE_TTL_S)
+    return data
+
+_NON_GROCERY_KEYWORDS = frozenset({
     "dog", "cat", "pet", "puppy", "kitten", "feline", "canine",
     "bird", "fish tank", "aquarium", "reptile", "hamster",
-}
+})
 
-_NON_GROCERY_STORES = {
+_NON_GROCERY_STORES = frozenset({
     # Pet stores
     "pet valu", "petsmart", "petland", "global pet foods", "ren's pets",
     # Electronics / tech
@@ -36,27 +146,46 @@ _NON_GROCERY_STORES = {
     # Other non-grocery
     "best new product awards", "eb games canada", "mark's",
     "bath depot", "linen chest", "rona & rona +",
-}
+})
 
-_NON_FOOD_KEYWORDS = {
+_NON_FOOD_KEYWORDS = frozenset({
     "laptop", "phone", "smartphone", "tablet", "iphone", "ipad",
     "macbook", "airpod", "headphone", "speaker", "cabinet",
     "amplifier", "charger", "funnels", "stool", "chair",
     "balloons", "washer fluid", "snow brush",
-}
+})
+
+# Single alternation over both keyword sets so each deal is scanned once.
+# Matched against already-lowercased text, so no IGNORECASE needed.
+_EXCLUDED_KEYWORD_RE = re.compile(
+    "|".join(
+        re.escape(kw)
+        for kw in sorted(_NON_GROCERY_KEYWORDS | _NON_FOOD_KEYWORDS, key=len, reverse=True)
+    )
+)
 
 
-def _is_relevant_deal(item: dict, query: str) -> bool:
+def _query_words(query: str) -> List[str]:
+    """Significant lowercased words of a search query (drops a, of, etc.)."""
+    return [w for w in query.lower().split() if len(w) > 2]
+
+
+def _is_relevant_deal(
+    item: dict,
+    query: str,
+    query_words: Optional[List[str]] = None,
+) -> bool:
     """Check whether a Flipp result is actually relevant to the search query.
 
     Flipp returns fuzzy matches that are often wrong (e.g. "black pepper" returns
     "sweet peppers", "chicken broth" returns pet food). This filters by:
     1. Requiring all significant query words in the item name/description
     2. Excluding pet stores and pet-food keywords
+
+    Callers filtering many items for one query can pass ``query_words``
+    (from ``_query_words``) so the query is only split once.
     """
-    item_name = (item.get("name") or "").lower()
-    item_desc = (item.get("description") or "").lower()
-    item_text = f"{item_name} {item_desc}"
+    item_text = f"{item.get('name') or ''} {item.get('description') or ''}".lower()
 
     # Skip items with no name
     if not item_text.strip():
@@ -72,23 +201,16 @@ def _is_relevant_deal(item: dict, query: str) -> bool:
     if l1 and l1 != "Food, Beverages & Tobacco":
         return False
 
-    # Exclude items with pet-food keywords
-    for kw in _NON_GROCERY_KEYWORDS:
-        if kw in item_text:
-            return False
-
-    # Reject non-food items that Flipp miscategorizes
-    for kw in _NON_FOOD_KEYWORDS:
-        if kw in item_text:
-            return False
-
     # All significant words from the query must appear in the item text.
-    # Split query into words, ignore very short words (a, of, etc.)
-    query_words = [w for w in query.lower().split() if len(w) > 2]
-    if not query_words:
-        return True
+    # Checked before the keyword regex: most of Flipp's fuzzy misses fail
+    # here on a couple of substring tests, so the regex only sees near-hits.
+    if query_words is None:
+        query_words = _query_words(query)
+    if not all(word in item_text for word in query_words):
+        return False
 
-    return all(word in item_text for word in query_words)
+    # Exclude pet-food keywords and non-food items that Flipp miscategorizes
+    return not _EXCLUDED_KEYWORD_RE.search(item_text)
 
 
 # ---------------------------------------------------------------------------
@@ -103,11 +225,16 @@ _WEIGHT_RE = re.compile(
     re.IGNORECASE,
 )
 
-# Count-based patterns: 6 pack, x12, 12 ct, 6 x 93 mL
-_COUNT_RE = re.compile(
-    r'(\d+)\s*(?:pack|pk|ct|count)\b'
-    r'|x\s*(\d+)\b'
-    r'|(\d+)\s*x\s*\d+',
+# Weight and count patterns (6 pack, x12, 12 ct, 6 x 93 mL) fused into one
+# scan. The count branch sits in a zero-width lookahead so it never consumes
+# text a later weight could match; weight still wins over count in a text.
+_SIZE_TOKEN_RE = re.compile(
+    r'(?P<value>\d+(?:\.\d+)?)\s*'
+    r'(?:-\s*(?P<range_end>\d+(?:\.\d+)?)\s*)?'
+    r'(?P<unit>kg|g|lb|lbs|oz|ml|l)\b'
+    r'|(?=(?:(?P<pack>\d+)\s*(?:pack|pk|ct|count)\b'
+    r'|x\s*(?P<times>\d+)\b'
+    r'|(?P<multi>\d+)\s*x\s*\d+))',
     re.IGNORECASE,
 )
 
@@ -117,11 +244,15 @@ def _extract_weight_from_text(*texts: str) -> Optional[Dict[str, str]]:
     for text in texts:
         if not text:
             continue
-        m = _WEIGHT_RE.search(text)
-        if m:
-            value = m.group(1)
-            range_end = m.group(2)
-            unit = m.group(3).lower()
+        count = None
+        for m in _SIZE_TOKEN_RE.finditer(text):
+            if not m.group("unit"):
+                if count is None:
+                    count = m.group("pack") or m.group("times") or m.group("multi")
+                continue
+            value = m.group("value")
+            range_end = m.group("range_end")
+            unit = m.group("unit").lower()
             # Normalize units
             if unit == "lbs":
                 unit = "lb"
@@ -134,12 +265,8 @@ def _extract_weight_from_text(*texts: str) -> Optional[Dict[str, str]]:
             display = f"{value}-{range_end} {unit}" if range_end else f"{value} {unit}"
             return {"weight": display, "source": "text"}
 
-        # Check for count patterns
-        cm = _COUNT_RE.search(text)
-        if cm:
-            count = cm.group(1) or cm.group(2) or cm.group(3)
-            if count:
-                return {"weight": f"{count} pk", "source": "text"}
+        if count:
+            return {"weight": f"{count} pk", "source": "text"}
     return None
 
 
@@ -201,16 +328,18 @@ def _calc_unit_price(
     """
     if price is None or price <= 0:
         return None
-
-    post_lower = post_price_text.lower()
+    # Most flyer items have no per-weight pricing text and no parsed size;
+    # nothing below can produce a unit price for them.
+    if not post_price_text and not weight_str:
+        return None
 
     # Multi-buy: "2/" means 2 for $price, so per-item = price / qty
-    multi_match = _MULTI_BUY_RE.match(pre_price_text)
+    multi_match = _MULTI_BUY_RE.match(pre_price_text) if pre_price_text else None
     if multi_match:
         price = price / int(multi_match.group(1))
 
     # Case 1: Price is already per-weight (post has /lb, lb, /kg, /100g)
-    per_weight_match = _PER_WEIGHT_RE.search(post_lower)
+    per_weight_match = _PER_WEIGHT_RE.search(post_price_text.lower()) if post_price_text else None
     if per_weight_match:
         per_unit = per_weight_match.group(1).lower().replace(" ", "")
         if per_unit == "lb":
@@ -291,6 +420,16 @@ async def _ocr_weight_from_service(image_url: str, client: httpx.AsyncClient) ->
     return result
 
 
+# Stand-ins for "no size found" / "no unit price" so deal construction can
+# read fields unconditionally instead of re-testing for None per field.
+_NO_WEIGHT_INFO: Dict[str, Optional[str]] = {"weight": None, "source": None}
+_NO_UNIT_PRICE_INFO: Dict[str, Any] = {
+    "unit_price": None,
+    "unit_price_display": None,
+    "comparison_unit": None,
+}
+
+
 def _parse_flipp_items(raw_items: list, limit: int = 5, query: str = "", category: Optional[str] = None) -> List[Dict[str, Any]]:
     """Parse raw Flipp API response items into a clean deal format.
 
@@ -301,11 +440,15 @@ def _parse_flipp_items(raw_items: list, limit: int = 5, query: str = "", categor
     If category is provided (e.g. "Food Items" or "Beverages"), only items
     whose _L2 field matches are included.
     """
-    deals = []
-    for item in raw_items:
-        if len(deals) >= limit:
-            break
+    return list(islice(_iter_flipp_deals(raw_items, query, category), max(limit, 0)))
+
 
+def _iter_flipp_deals(
+    raw_items: list, query: str = "", category: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Lazily filter and format Flipp items, so callers stop once they have enough."""
+    query_words = _query_words(query) if query else None
+    for item in raw_items:
         # Category filter (by _L2 field)
         if category:
             l2 = (item.get("_L2") or "").strip()
@@ -313,7 +456,7 @@ def _parse_flipp_items(raw_items: list, limit: int = 5, query: str = "", categor
                 continue
 
         # Skip results that don't actually match the searched item
-        if query and not _is_relevant_deal(item, query):
+        if query and not _is_relevant_deal(item, query, query_words):
             continue
 
         # Extract price info
@@ -335,17 +478,17 @@ def _parse_flipp_items(raw_items: list, limit: int = 5, query: str = "", categor
         # Extract weight/size from text fields (not post_price_text — that's a pricing unit)
         item_name = item.get("name") or item.get("description") or "Unknown Item"
         description = item.get("description") or ""
-        weight_info = _extract_weight_from_text(item_name, description)
+        weight_info = _extract_weight_from_text(item_name, description) or _NO_WEIGHT_INFO
         unit_price_info = _calc_unit_price(
-            price, pre_price_text, post_price_text,
-            weight_info["weight"] if weight_info else None,
-        )
+            price, pre_price_text, post_price_text, weight_info["weight"],
+        ) or _NO_UNIT_PRICE_INFO
+        original_price = item.get("original_price")
 
-        deal = {
+        yield {
             "store": store,
             "item": item_name,
             "price": display_price,
-            "original_price": f"${item['original_price']:.2f}" if item.get("original_price") else None,
+            "original_price": f"${original_price:.2f}" if original_price else None,
             "pre_price_text": pre_price_text,
             "post_price_text": post_price_text,
             "sale_story": item.get("sale_story", ""),
@@ -354,15 +497,12 @@ def _parse_flipp_items(raw_items: list, limit: int = 5, query: str = "", categor
             "image_url": image_url,
             "item_type": item.get("item_type", ""),
             "merchant_logo": item.get("merchant_logo") or "",
-            "weight": weight_info["weight"] if weight_info else None,
-            "weight_source": weight_info["source"] if weight_info else None,
-            "unit_price": unit_price_info["unit_price"] if unit_price_info else None,
-            "unit_price_display": unit_price_info["unit_price_display"] if unit_price_info else None,
-            "comparison_unit": unit_price_info["comparison_unit"] if unit_price_info else None,
+            "weight": weight_info["weight"],
+            "weight_source": weight_info["source"],
+            "unit_price": unit_price_info["unit_price"],
+            "unit_price_display": unit_price_info["unit_price_display"],
+            "comparison_unit": unit_price_info["comparison_unit"],
         }
-        deals.append(deal)
-
-    return deals
 
 
 async def find_nearby_stores(
@@ -373,42 +513,54 @@ async def find_nearby_stores(
 ) -> Dict[str, List[Dict[str, Any]]]:
     """Find nearby store locations using OpenStreetMap Overpass API.
 
-    Queries by brand tag for all store names in a single batch request.
+    Queries by brand tag for all uncached store names in a single batch request.
     Returns a dict mapping each input store name to a list of nearby locations
     with lat, lng, and address.
     """
     if not store_names:
         return {}
 
-    cache_key = f"{'|'.join(sorted(store_names))}|{center_lat:.2f},{center_lng:.2f}"
-    if cache_key in _overpass_cache:
-        return _overpass_cache[cache_key]
+    area_key = f"{center_lat:.2f},{center_lng:.2f}|{radius_m}"
+    cached: Dict[str, List[Dict[str, Any]]] = {}
+    missing: List[str] = []
+    for name in store_names:
+        locations = _overpass_cache.get(f"{name}|{area_key}")
+        if locations is None:
+            missing.append(name)
+        else:
+            cached[name] = locations
+    if not missing:
+        return {name: cached[name] for name in store_names}
 
     # Build regex alternation for brand matching
-    escaped_names = [name.replace('"', '\\"') for name in store_names]
+    escaped_names = [name.replace('"', '\\"') for name in missing]
     brand_regex = "|".join(escaped_names)
 
     query = (
         f'[out:json][timeout:10];'
         f'nwr["brand"~"{brand_regex}",i]["shop"](around:{radius_m},{center_lat},{center_lng});'
-        f'out center 50;'
+        f'out center {_OVERPASS_MAX_ELEMENTS};'
     )
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.post(
-                OVERPASS_API_URL,
-                data={"data": query},
-                headers={"User-Agent": "SmartAppetiteManager/1.0 (hackathon project)"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        client = _get_http_client()
+        resp = await client.post(
+            OVERPASS_API_URL,
+            data={"data": query},
+            headers=_OSM_HEADERS,
+        )
+        resp.raise_for_status()
+        data = resp.json()
 
         # Group results by matching store name
-        results: Dict[str, List[Dict[str, Any]]] = {name: [] for name in store_names}
-        name_lower_map = {name.lower(): name for name in store_names}
-
-        for element in data.get("elements", []):
+        results: Dict[str, List[Dict[str, Any]]] = {name: [] for name in missing}
+        name_lower_map = {name.lower(): name for name in missing}
+        # brand tag -> input store name. Seeded with exact hits; the substring
+        # scan below runs at most once per distinct brand and is memoized here.
+        brand_matches: Dict[str, Optional[str]] = dict(name_lower_map)
+
+        elements = data.get("elements", [])
+        for element in elements:
             tags = element.get("tags", {})
             # Get coordinates (nodes have lat/lon directly, ways/relations have center)
             lat = element.get("lat") or (element.get("center", {}) or {}).get("lat")
@@ -431,11 +583,15 @@ async def find_nearby_stores(
 
             # Match to input store name via brand or name tag
             brand = (tags.get("brand") or tags.get("name") or "").lower()
-            matched_name = None
-            for input_lower, input_original in name_lower_map.items():
-                if input_lower in brand or brand in input_lower:
-                    matched_name = input_original
-                    break
+            if brand in brand_matches:
+                matched_name = brand_matches[brand]
+            else:
+                matched_name = None
+                for input_lower, input_original in name_lower_map.items():
+                    if input_lower in brand or brand in input_lower:
+                        matched_name = input_original
+                        break
+                brand_matches[brand] = matched_name
 
             if matched_name:
                 results[matched_name].append({
@@ -445,13 +601,19 @@ async def find_nearby_stores(
                     "address": address,
                 })
 
-        _overpass_cache[cache_key] = results
-        log.info(f"[ShopperTools] Overpass returned stores for {len([n for n, v in results.items() if v])} of {len(store_names)} chains")
-        return results
+        # A response that hit the element cap may have crowded some chains
+        # out, so none of it is cached; neither is a chain with no hits.
+        if len(elements) < _OVERPASS_MAX_ELEMENTS:
+            for name, locations in results.items():
+                if locations:
+                    _overpass_cache.set(f"{name}|{area_key}", locations, _OVERPASS_CACHE_TTL_S)
+        log.info(f"[ShopperTools] Overpass returned stores for {len([n for n, v in results.items() if v])} of {len(missing)} chains")
+        results.update(cached)
+        return {name: results[name] for name in store_names}
 
     except Exception as e:
         log.warning(f"[ShopperTools] Overpass query failed: {e}")
-        return {name: [] for name in store_names}
+        return {name: cached.get(name, []) for name in store_names}
 
 
 async def check_local_flyers(
@@ -465,126 +627,122 @@ async def check_local_flyers(
     """Search Flipp for current grocery flyer deals on an item near the user's postal code."""
     log.info(f"[ShopperTools] Checking Flipp flyers for: {item_name}")
 
-    postal_code = (tool_config.get("postal_code") if tool_config else None) or "K1A 0A6"
-    locale = (tool_config.get("locale") if tool_config else None) or "en-us"
-
-    params = {
-        "locale": locale,
-        "postal_code": postal_code,
-        "q": item_name,
-    }
+    params = {**_flipp_params_base(tool_config), "q": item_name}
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(FLIPP_SEARCH_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-            raw_items = data.get("items", [])
-            if not raw_items:
-                return {"status": "not_found", "message": f"No flyer deals found for '{item_name}'."}
-
-            deals = _parse_flipp_items(raw_items, limit=limit, query=item_name, category=category)
-            if not deals:
-                return {"status": "not_found", "message": f"No relevant flyer deals found for '{item_name}'."}
-
-            # OCR fallback: for deals missing weight, try reading the flyer image
-            if _OCR_SERVICE_URL:
-                ocr_tasks = []
-                for deal in deals:
-                    if not deal.get("weight") and deal.get("image_url"):
-                        ocr_tasks.append((deal, _ocr_weight_from_service(deal["image_url"], client)))
-                if ocr_tasks:
-                    ocr_results = await asyncio.gather(
-                        *[task for _, task in ocr_tasks],
-                        return_exceptions=True,
-                    )
-                    for (deal, _), result in zip(ocr_tasks, ocr_results):
-                        if isinstance(result, dict) and result.get("weight"):
-                            deal["weight"] = result["weight"]
-                            deal["weight_source"] = "ocr"
-                            # Recalculate unit price with newly discovered weight
-                            try:
-                                raw_price = float(deal["price"].replace("$", "").split()[0])
-                            except (ValueError, IndexError):
-                                raw_price = None
-                            recalc = _calc_unit_price(
-                                raw_price,
-                                deal.get("pre_price_text", ""),
-                                deal.get("post_price_text", ""),
-                                result["weight"],
-                            )
-                            if recalc:
-                                deal["unit_price"] = recalc["unit_price"]
-                                deal["unit_price_display"] = recalc["unit_price_display"]
-                                deal["comparison_unit"] = recalc["comparison_unit"]
-
-            return {"status": "success", "deals": deals}
+        data = await _flipp_search(params)
+
+        raw_items = data.get("items", [])
+        if not raw_items:
+            return {"status": "not_found", "message": f"No flyer deals found for '{item_name}'."}
+
+        deals = _parse_flipp_items(raw_items, limit=limit, query=item_name, category=category)
+        if not deals:
+            return {"status": "not_found", "message": f"No relevant flyer deals found for '{item_name}'."}
+
+        # OCR fallback: for deals missing weight, try reading the flyer image
+        if _OCR_SERVICE_URL:
+            ocr_tasks = []
+            for deal in deals:
+                if not deal.get("weight") and deal.get("image_url"):
+                    ocr_tasks.append((deal, _ocr_weight_from_service(deal["image_url"], _get_http_client())))
+            if ocr_tasks:
+                ocr_results = await asyncio.gather(
+                    *[task for _, task in ocr_tasks],
+                    return_exceptions=True,
+                )
+                for (deal, _), result in zip(ocr_tasks, ocr_results):
+                    if isinstance(result, dict) and result.get("weight"):
+                        deal["weight"] = result["weight"]
+                        deal["weight_source"] = "ocr"
+                        # Recalculate unit price with newly discovered weight
+                        try:
+                            raw_price = float(deal["price"].replace("$", "").split()[0])
+                        except (ValueError, IndexError):
+                            raw_price = None
+                        recalc = _calc_unit_price(
+                            raw_price,
+                            deal.get("pre_price_text", ""),
+                            deal.get("post_price_text", ""),
+                            result["weight"],
+                        )
+                        if recalc:
+                            deal["unit_price"] = recalc["unit_price"]
+                            deal["unit_price_display"] = recalc["unit_price_display"]
+                            deal["comparison_unit"] = recalc["comparison_unit"]
+
+        return {"status": "success", "deals": deals}
 
     except Exception as e:
         log.error(f"[ShopperTools] Flipp API failure: {e}", exc_info=True)
         return {"status": "error", "message": str(e)}
 
 
-_FLIPP_MAX_CONCURRENT = 10
-
-
 async def _fetch_item_deals(
     item: str,
-    client: httpx.AsyncClient,
-    semaphore: asyncio.Semaphore,
     params_base: Dict[str, str],
 ) -> tuple[str, Dict[str, Any]]:
-    """Fetch Flipp deals for a single item, respecting the concurrency semaphore."""
-    async with semaphore:
-        try:
-            resp = await client.get(FLIPP_SEARCH_URL, params={**params_base, "q": item})
-            resp.raise_for_status()
-            raw_items = resp.json().get("items", [])
+    """Fetch Flipp deals for a single item."""
+    try:
+        raw_items = (await _flipp_search({**params_base, "q": item})).get("items", [])
 
-            if raw_items:
-                deals = _parse_flipp_items(raw_items, limit=5, query=item)
-                if deals:
-                    return item, {"found": True, "options": deals}
-                return item, {"found": False, "note": f"No relevant flyer deals found for '{item}'."}
-            return item, {"found": False, "note": f"No flyer deals found for '{item}'."}
+        if raw_items:
+            deals = _parse_flipp_items(raw_items, limit=5, query=item)
+            if deals:
+                return item, {"found": True, "options": deals}
+            return item, {"found": False, "note": f"No relevant flyer deals found for '{item}'."}
+        return item, {"found": False, "note": f"No flyer deals found for '{item}'."}
 
-        except Exception as e:
-            log.warning(f"[ShopperTools] Flipp search failed for '{item}': {e}")
-            return item, {"found": False, "note": f"Search failed: {str(e)}"}
+    except Exception as e:
+        log.warning(f"[ShopperTools] Flipp search failed for '{item}': {e}")
+        return item, {"found": False, "note": f"Search failed: {str(e)}"}
 
 
 async def _fetch_item_names(
     item: str,
-    client: httpx.AsyncClient,
-    semaphore: asyncio.Semaphore,
     params_base: Dict[str, str],
     limit: int = 20,
 ) -> tuple[str, Dict[str, Any]]:
     """Fetch Flipp product names for a single item (lightweight preview)."""
-    async with semaphore:
-        try:
-            resp = await client.get(FLIPP_SEARCH_URL, params={**params_base, "q": item})
-            resp.raise_for_status()
-            raw_items = resp.json().get("items", [])
-
-            names = []
-            for raw in raw_items:
-                if len(names) >= limit:
-                    break
-                if not _is_relevant_deal(raw, item):
-                    continue
-                name = raw.get("name") or raw.get("description") or ""
-                if name:
-                    names.append(name)
-
-            if names:
-                return item, {"found": True, "product_names": names}
-            return item, {"found": False, "product_names": []}
-
-        except Exception as e:
-            log.warning(f"[ShopperTools] Flipp preview failed for '{item}': {e}")
-            return item, {"found": False, "product_names": []}
+    try:
+        raw_items = (await _flipp_search({**params_base, "q": item})).get("items", [])
+
+        names = []
+        query_words = _query_words(item)
+        for raw in raw_items:
+            if len(names) >= limit:
+                break
+            if not _is_relevant_deal(raw, item, query_words):
+                continue
+            name = raw.get("name") or raw.get("description") or ""
+            if name:
+                names.append(name)
+
+        if names:
+            return item, {"found": True, "product_names": names}
+        return item, {"found": False, "product_names": []}
+
+    except Exception as e:
+        log.warning(f"[ShopperTools] Flipp preview failed for '{item}': {e}")
+        return item, {"found": False, "product_names": []}
+
+
+async def _gather_unique_items(
+    items: List[str],
+    fetch: Callable[[str], Awaitable[Tuple[str, Any]]],
+) -> List[Tuple[str, Any]]:
+    """Run ``fetch`` once per distinct item and return ``(item, result)`` for every input item.
+
+    Items are compared stripped and lowercased, so "Milk" and "milk " share a
+    single Flipp search (made with the first spelling seen). Duplicates share
+    the same result object.
+    """
+    unique: Dict[str, str] = {}
+    for item in items:
+        unique.setdefault(item.strip().lower(), item)
+    pairs = await asyncio.gather(*[fetch(item) for item in unique.values()])
+    by_key = {key: result for key, (_, result) in zip(unique, pairs)}
+    return [(item, by_key[item.strip().lower()]) for item in items]
 
 
 async def preview_flipp_items(
@@ -602,15 +760,11 @@ async def preview_flipp_items(
     """
     log_id = "[ShopperTools:preview_flipp_items]"
     try:
-        postal_code = (tool_config.get("postal_code") if tool_config else None) or "K1A 0A6"
-        locale = (tool_config.get("locale") if tool_config else None) or "en-us"
-        params_base = {"locale": locale, "postal_code": postal_code}
-
-        semaphore = asyncio.Semaphore(_FLIPP_MAX_CONCURRENT)
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            pairs = await asyncio.gather(
-                *[_fetch_item_names(item, client, semaphore, params_base, limit) for item in items]
-            )
+        params_base = _flipp_params_base(tool_config)
+
+        pairs = await _gather_unique_items(
+            items, lambda item: _fetch_item_names(item, params_base, limit)
+        )
 
         results = dict(pairs)
         log.info(f"{log_id} Previewed {len(items)} items")
@@ -629,18 +783,14 @@ async def find_best_deals_batch(
 ) -> Dict[str, Any]:
     """Search Flipp for the best deals on a list of grocery items, returning results per item."""
     try:
-        postal_code = (tool_config.get("postal_code") if tool_config else None) or "K1A 0A6"
-        locale = (tool_config.get("locale") if tool_config else None) or "en-us"
-        params_base = {"locale": locale, "postal_code": postal_code}
-
-        semaphore = asyncio.Semaphore(_FLIPP_MAX_CONCURRENT)
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            pairs = await asyncio.gather(
-                *[_fetch_item_deals(item, client, semaphore, params_base) for item in items]
-            )
+        params_base = _flipp_params_base(tool_config)
+
+        pairs = await _gather_unique_items(
+            items, lambda item: _fetch_item_deals(item, params_base)
+        )
 
         results = dict(pairs)
-        return {"status": "success", "summary": results, "location_used": location, "postal_code": postal_code}
+        return {"status": "success", "summary": results, "location_used": location, "postal_code": params_base["postal_code"]}
 
     except Exception as e:
         log.error(f"[ShopperTools] Batch search failed: {e}", exc_info=True)
@@ -659,18 +809,14 @@ async def find_deals_with_map(
     coordinates for rendering an interactive map on the frontend.
     """
     try:
-        postal_code = (tool_config.get("postal_code") if tool_config else None) or "K1A 0A6"
-        locale = (tool_config.get("locale") if tool_config else None) or "en-us"
+        params_base = _flipp_params_base(tool_config)
         map_center_lat = float(tool_config.get("map_center_lat", 45.4215)) if tool_config else 45.4215
         map_center_lng = float(tool_config.get("map_center_lng", -75.6972)) if tool_config else -75.6972
-        params_base = {"locale": locale, "postal_code": postal_code}
 
         # Fetch all items concurrently
-        semaphore = asyncio.Semaphore(_FLIPP_MAX_CONCURRENT)
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            pairs = await asyncio.gather(
-                *[_fetch_item_deals(item, client, semaphore, params_base) for item in items]
-            )
+        pairs = await _gather_unique_items(
+            items, lambda item: _fetch_item_deals(item, params_base)
+        )
 
         results = dict(pairs)
 
@@ -747,7 +893,7 @@ async def find_deals_with_map(
             "summary": results,
             "shopper_map_data": shopper_map_data,
             "location_used": location,
-            "postal_code": postal_code,
+            "postal_code": params_base["postal_code"],
         }
 
     except Exception as e:
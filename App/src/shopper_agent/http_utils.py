@@ -0,0 +1,87 @@
+"""
+Shared async HTTP helpers for the agent tool modules.
+
+LoopLocal keeps one object (an httpx client, a semaphore) per running event
+loop. Both are bound to the loop they were first used on, and SAM may run
+tools on more than one loop.
+
+TTLCache is a small in-process response cache with per-entry expiry and an
+entry cap (oldest entry evicted first).
+
+Lives inside shopper_agent so grocery_tools can import it relatively: the
+inventory REST API loads that module as src.shopper_agent.grocery_tools,
+while SAM loads it as shopper_agent.grocery_tools.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopLocal(Generic[T]):
+    """Lazily create and reuse one ``factory()`` result per running event loop.
+
+    ``is_stale`` can reject a cached object (e.g. a closed client) so a fresh
+    one is created in its place. Whenever a new object is created, entries
+    for loops that have closed are dropped. Objects are only dereferenced,
+    not closed: a client can't be aclose()d once its loop is gone.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        is_stale: Optional[Callable[[T], bool]] = None,
+    ) -> None:
+        self._factory = factory
+        self._is_stale = is_stale
+        self._objects: Dict[asyncio.AbstractEventLoop, T] = {}
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        obj = self._objects.get(loop)
+        if obj is None or (self._is_stale is not None and self._is_stale(obj)):
+            for old_loop in [l for l in self._objects if l.is_closed()]:
+                del self._objects[old_loop]
+            obj = self._factory()
+            self._objects[loop] = obj
+        return obj
+
+
+class TTLCache:
+    """Insertion-ordered dict of ``key -> (expires_at, value)`` capped at ``max_entries``.
+
+    Values are shared between callers, so treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        # Re-inserting moves the key to the end, so the first key is always
+        # the oldest entry. Expired entries are dropped from the front; with
+        # mixed TTLs a long-lived entry can hold back later expired ones
+        # until it expires or the cap evicts it.
+        self._entries.pop(key, None)
+        now = time.monotonic()
+        while self._entries:
+            oldest = next(iter(self._entries))
+            if self._entries[oldest][0] > now:
+                break
+            del self._entries[oldest]
+        if len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (now + ttl, value)
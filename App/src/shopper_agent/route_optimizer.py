@@ -2,10 +2,19 @@ import logging
 import httpx
 import asyncio
 import math
+import time
 from itertools import combinations
 from typing import Any, Dict, List, Optional, Tuple
 
-from shopper_agent.grocery_tools import FLIPP_SEARCH_URL, _parse_flipp_items
+from shopper_agent.grocery_tools import (
+    _OSM_HEADERS,
+    _flipp_params_base,
+    _flipp_search,
+    _gather_unique_items,
+    _get_http_client,
+    _parse_flipp_items,
+    find_nearby_stores,
+)
 
 log = logging.getLogger(__name__)
 
@@ -14,6 +23,11 @@ NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
 # Shared geocode cache
 _geocode_cache: Dict[str, Optional[Dict[str, float]]] = {}
 
+# Nominatim's usage policy allows one request per second; only real requests
+# count, so cache hits are never delayed.
+_NOMINATIM_MIN_INTERVAL_S = 1.1
+_last_nominatim_request = 0.0
+
 
 def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """Calculate the great-circle distance between two points in km."""
@@ -277,10 +291,20 @@ async def _geocode_store(
     client: httpx.AsyncClient,
 ) -> Optional[Dict[str, float]]:
     """Geocode a store using Nominatim with a viewbox bounded to ~30km around the center."""
+    global _last_nominatim_request
+
     cache_key = f"{store_name}|{center_lat:.2f},{center_lng:.2f}"
     if cache_key in _geocode_cache:
         return _geocode_cache[cache_key]
 
+    # Claim the next free slot before sleeping, so concurrent geocodes queue
+    # up one interval apart instead of all waking at the same moment.
+    now = time.monotonic()
+    slot = max(now, _last_nominatim_request + _NOMINATIM_MIN_INTERVAL_S)
+    _last_nominatim_request = slot
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
     OFFSET = 0.3
     viewbox = f"{center_lng - OFFSET},{center_lat + OFFSET},{center_lng + OFFSET},{center_lat - OFFSET}"
 
@@ -293,8 +317,7 @@ async def _geocode_store(
             "viewbox": viewbox,
             "bounded": "1",
         }
-        headers = {"User-Agent": "SmartAppetiteManager/1.0 (hackathon project)"}
-        resp = await client.get(NOMINATIM_SEARCH_URL, params=params, headers=headers)
+        resp = await client.get(NOMINATIM_SEARCH_URL, params=params, headers=_OSM_HEADERS)
         resp.raise_for_status()
         results = resp.json()
 
@@ -310,6 +333,21 @@ async def _geocode_store(
     return None
 
 
+async def _fetch_route_deals(
+    item: str,
+    params_base: Dict[str, str],
+) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+    """Fetch Flipp deals for one item; None when the search found nothing or failed."""
+    try:
+        raw_items = (await _flipp_search({**params_base, "q": item})).get("items", [])
+        if raw_items:
+            return item, _parse_flipp_items(raw_items, limit=10)
+        return item, None
+    except Exception as e:
+        log.warning(f"[RouteOptimizer] Flipp search failed for '{item}': {e}")
+        return item, None
+
+
 async def plan_optimal_route(
     items: List[str],
     weight_price: float = 0.35,
@@ -336,8 +374,6 @@ async def plan_optimal_route(
     log_id = f"[RouteOptimizer:plan:{len(items)} items]"
     log.info(f"{log_id} Starting route optimization")
 
-    postal_code = (tool_config.get("postal_code") if tool_config else None) or "K1A 0A6"
-    locale = (tool_config.get("locale") if tool_config else None) or "en-us"
     map_center_lat = float(tool_config.get("map_center_lat", 45.4215)) if tool_config else 45.4215
     map_center_lng = float(tool_config.get("map_center_lng", -75.6972)) if tool_config else -75.6972
 
@@ -348,54 +384,60 @@ async def plan_optimal_route(
         "distance": weight_distance,
     }
 
-    # Step 1: Fetch deals for all items from Flipp
+    # Step 1: Fetch deals for all items from Flipp (concurrently, bounded)
     all_deals: Dict[str, List[Dict[str, Any]]] = {}
     items_not_found = []
+    params_base = _flipp_params_base(tool_config)
+
+    pairs = await _gather_unique_items(
+        items, lambda item: _fetch_route_deals(item, params_base)
+    )
+    for item, deals in pairs:
+        if deals is None:
+            items_not_found.append(item)
+        else:
+            all_deals[item] = deals
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        for item in items:
-            params = {"locale": locale, "postal_code": postal_code, "q": item}
-            try:
-                resp = await client.get(FLIPP_SEARCH_URL, params=params)
-                resp.raise_for_status()
-                data = resp.json()
-                raw_items = data.get("items", [])
-
-                if raw_items:
-                    deals = _parse_flipp_items(raw_items, limit=10)
-                    all_deals[item] = deals
-                else:
-                    items_not_found.append(item)
-            except Exception as e:
-                log.warning(f"{log_id} Flipp search failed for '{item}': {e}")
-                items_not_found.append(item)
-
-        if not all_deals:
-            return {
-                "status": "no_deals",
-                "message": "No flyer deals found for any of the requested items.",
-                "items_searched": items,
-            }
-
-        # Step 2: Build store-item matrix
-        matrix, all_stores, all_items_found = _build_store_item_matrix(all_deals)
-        log.info(f"{log_id} Found {len(all_stores)} stores across {len(all_items_found)} items")
-
-        # Step 3: Generate candidate routes
-        candidates = _generate_candidate_routes(matrix, all_stores, all_items_found)
-        log.info(f"{log_id} Generated {len(candidates)} candidate routes")
-
-        # Step 4: Geocode stores for distance calculation
-        store_coords: Dict[str, Dict[str, float]] = {}
-        unique_stores = set()
-        for route in candidates:
-            unique_stores.update(route["stores"])
-
-        for store_name in unique_stores:
-            coords = await _geocode_store(store_name, map_center_lat, map_center_lng, client)
-            if coords:
-                store_coords[store_name] = coords
-            await asyncio.sleep(1.1)  # Nominatim rate limit
+    if not all_deals:
+        return {
+            "status": "no_deals",
+            "message": "No flyer deals found for any of the requested items.",
+            "items_searched": items,
+        }
+
+    # Step 2: Build store-item matrix
+    matrix, all_stores, all_items_found = _build_store_item_matrix(all_deals)
+    log.info(f"{log_id} Found {len(all_stores)} stores across {len(all_items_found)} items")
+
+    # Step 3: Generate candidate routes
+    candidates = _generate_candidate_routes(matrix, all_stores, all_items_found)
+    log.info(f"{log_id} Generated {len(candidates)} candidate routes")
+
+    # Step 4: Locate stores for distance calculation. One batched Overpass
+    # query covers most chains at once; Nominatim (limited to 1 req/s) only
+    # geocodes the stores Overpass could not place, pacing itself between
+    # uncached lookups.
+    store_coords: Dict[str, Dict[str, float]] = {}
+    unique_stores = set()
+    for route in candidates:
+        unique_stores.update(route["stores"])
+
+    nearby = await find_nearby_stores(sorted(unique_stores), map_center_lat, map_center_lng)
+    for store_name, locations in nearby.items():
+        if locations:
+            best = min(
+                locations,
+                key=lambda loc: (loc["lat"] - map_center_lat) ** 2
+                + (loc["lng"] - map_center_lng) ** 2,
+            )
+            store_coords[store_name] = {"lat": best["lat"], "lng": best["lng"]}
+
+    for store_name in unique_stores - store_coords.keys():
+        coords = await _geocode_store(
+            store_name, map_center_lat, map_center_lng, _get_http_client()
+        )
+        if coords:
+            store_coords[store_name] = coords
 
     # Step 5: Score and rank routes
     scored_routes = _score_routes(candidates, store_coords, map_center_lat, map_center_lng, weights)
@@ -10,21 +10,23 @@ Pipeline:
   Step 6: (done by the LLM agent — reasons about the best 1-2 store combo)
 """
 
-import asyncio
 import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
-from shopper_agent.grocery_tools import find_nearby_stores
+from shopper_agent.grocery_tools import (
+    _flipp_params_base,
+    _flipp_search,
+    _gather_unique_items,
+    find_nearby_stores,
+)
 
 log = logging.getLogger(__name__)
 
-FLIPP_SEARCH_URL = "https://backflipp.wishabi.com/flipp/items/search"
-_FLIPP_MAX_CONCURRENT = 10
 
 # Store tiers: markup over Walmart baseline for price inference
 STORE_TIERS = {
@@ -53,18 +55,34 @@ STORE_TIERS = {
     "Rexall": ("premium", 0.20),
 }
 
-NON_GROCERY_STORES = {
+NON_GROCERY_STORES = frozenset({
     "pet valu", "petsmart", "petland", "best buy", "the source", "staples",
     "canadian tire", "home hardware", "leon's", "the brick", "ikea",
     "long & mcquade musical instruments", "party city", "sephora", "lcbo",
     "best new product awards", "eb games canada", "mark's",
     "bath depot", "linen chest", "rona & rona +", "bureau en gros",
-}
+})
 
 
 # ---------------------------------------------------------------------------
 # LLM call helper (reused from receipt_scanner_tools pattern)
 # ---------------------------------------------------------------------------
+def _llm_settings(tool_config: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str, str]]:
+    """Resolve (model, api_base, api_key) from tool_config, or None if unconfigured."""
+    cfg = tool_config or {}
+    api_base = (cfg.get("api_base") or cfg.get("endpoint", "")).rstrip("/")
+    api_key = cfg.get("api_key", "")
+    if not api_base or not api_key:
+        return None
+    raw_model = (
+        cfg.get("model")
+        or cfg.get("model_name")
+        or os.getenv("LLM_SERVICE_GENERAL_MODEL_NAME", "gpt-4o")
+    )
+    model = raw_model.split("/", 1)[-1] if "/" in raw_model else raw_model
+    return model, api_base, api_key
+
+
 async def _call_llm(
     messages: List[Dict[str, Any]],
     model: str,
@@ -143,55 +161,48 @@ def _basic_food_filter(item: dict) -> bool:
 
 async def _fetch_single_item(
     search_term: str,
-    client: httpx.AsyncClient,
-    semaphore: asyncio.Semaphore,
     params_base: Dict[str, str],
 ) -> tuple:
     """Fetch both flyer and ecom results for a single search term."""
-    async with semaphore:
-        try:
-            resp = await client.get(
-                FLIPP_SEARCH_URL, params={**params_base, "q": search_term}
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            flyer_items = []
-            for raw in data.get("items", []):
-                if not _basic_food_filter(raw):
-                    continue
-                flyer_items.append({
-                    "flyer_item_id": raw.get("flyer_item_id") or raw.get("id"),
-                    "name": raw.get("name") or raw.get("description") or "Unknown",
-                    "store": raw.get("merchant_name") or "Unknown",
-                    "price": raw.get("current_price"),
-                    "post_price_text": raw.get("post_price_text") or "",
-                    "pre_price_text": raw.get("pre_price_text") or "",
-                    "original_price": raw.get("original_price"),
-                    "sale_story": raw.get("sale_story") or "",
-                    "valid_to": raw.get("valid_to") or "",
-                    "image_url": raw.get("clean_image_url") or raw.get("clipping_image_url") or "",
-                    "store_logo": raw.get("merchant_logo") or "",
-                })
-
-            ecom_items = []
-            for raw in data.get("ecom_items", []):
-                if not _basic_food_filter(raw):
-                    continue
-                ecom_items.append({
-                    "item_id": raw.get("item_id") or raw.get("sku"),
-                    "name": raw.get("name") or raw.get("description") or "Unknown",
-                    "store": raw.get("merchant") or "Unknown",
-                    "price": raw.get("current_price"),
-                    "original_price": raw.get("original_price"),
-                    "store_logo": raw.get("merchant_logo") or "",
-                })
-
-            return search_term, {"flyer": flyer_items, "ecom": ecom_items}
-
-        except Exception as e:
-            log.warning(f"[ShopperTools] Flipp fetch failed for '{search_term}': {e}")
-            return search_term, {"flyer": [], "ecom": []}
+    try:
+        data = await _flipp_search({**params_base, "q": search_term})
+
+        flyer_items = []
+        for raw in data.get("items", []):
+            if not _basic_food_filter(raw):
+                continue
+            flyer_items.append({
+                "flyer_item_id": raw.get("flyer_item_id") or raw.get("id"),
+                "name": raw.get("name") or raw.get("description") or "Unknown",
+                "store": raw.get("merchant_name") or "Unknown",
+                "price": raw.get("current_price"),
+                "post_price_text": raw.get("post_price_text") or "",
+                "pre_price_text": raw.get("pre_price_text") or "",
+                "original_price": raw.get("original_price"),
+                "sale_story": raw.get("sale_story") or "",
+                "valid_to": raw.get("valid_to") or "",
+                "image_url": raw.get("clean_image_url") or raw.get("clipping_image_url") or "",
+                "store_logo": raw.get("merchant_logo") or "",
+            })
+
+        ecom_items = []
+        for raw in data.get("ecom_items", []):
+            if not _basic_food_filter(raw):
+                continue
+            ecom_items.append({
+                "item_id": raw.get("item_id") or raw.get("sku"),
+                "name": raw.get("name") or raw.get("description") or "Unknown",
+                "store": raw.get("merchant") or "Unknown",
+                "price": raw.get("current_price"),
+                "original_price": raw.get("original_price"),
+                "store_logo": raw.get("merchant_logo") or "",
+            })
+
+        return search_term, {"flyer": flyer_items, "ecom": ecom_items}
+
+    except Exception as e:
+        log.warning(f"[ShopperTools] Flipp fetch failed for '{search_term}': {e}")
+        return search_term, {"flyer": [], "ecom": []}
 
 
 async def fetch_flipp_raw(
@@ -207,16 +218,12 @@ async def fetch_flipp_raw(
     log_id = "[ShopperTools:fetch_flipp_raw]"
     log.info(f"{log_id} Fetching {len(items)} items from Flipp")
 
-    postal_code = (tool_config.get("postal_code") if tool_config else None) or "K1A 0A6"
-    locale = (tool_config.get("locale") if tool_config else None) or "en-us"
-    params_base = {"locale": locale, "postal_code": postal_code}
+    params_base = _flipp_params_base(tool_config)
 
-    semaphore = asyncio.Semaphore(_FLIPP_MAX_CONCURRENT)
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            pairs = await asyncio.gather(
-                *[_fetch_single_item(item, client, semaphore, params_base) for item in items]
-            )
+        pairs = await _gather_unique_items(
+            items, lambda item: _fetch_single_item(item, params_base)
+        )
         raw_metrics = dict(pairs)
         log.info(f"{log_id} Fetched data for {len(raw_metrics)} items")
         return {"status": "success", "raw_metrics": raw_metrics}
@@ -236,19 +243,11 @@ async def _generate_exclude_list_via_llm(
     """Call LLM to generate exclude lists for each search term."""
     log_id = "[ShopperTools:generate_exclude_list]"
 
-    cfg = tool_config or {}
-    raw_model = (
-        cfg.get("model")
-        or cfg.get("model_name")
-        or os.getenv("LLM_SERVICE_GENERAL_MODEL_NAME", "gpt-4o")
-    )
-    model = raw_model.split("/", 1)[-1] if "/" in raw_model else raw_model
-    api_base = (cfg.get("api_base") or cfg.get("endpoint", "")).rstrip("/")
-    api_key = cfg.get("api_key", "")
-
-    if not api_base or not api_key:
+    llm = _llm_settings(tool_config)
+    if llm is None:
         log.warning(f"{log_id} No LLM config, returning empty exclude lists")
         return {}
+    model, api_base, api_key = llm
 
     # Build prompt with all product names
     items_summary = {}
@@ -364,19 +363,11 @@ async def enrich_flipp_results(
     """
     log_id = "[ShopperTools:enrich_flipp_results]"
 
-    cfg = tool_config or {}
-    raw_model = (
-        cfg.get("model")
-        or cfg.get("model_name")
-        or os.getenv("LLM_SERVICE_GENERAL_MODEL_NAME", "gpt-4o")
-    )
-    model = raw_model.split("/", 1)[-1] if "/" in raw_model else raw_model
-    api_base = (cfg.get("api_base") or cfg.get("endpoint", "")).rstrip("/")
-    api_key = cfg.get("api_key", "")
-
-    if not api_base or not api_key:
+    llm = _llm_settings(tool_config)
+    if llm is None:
         log.warning(f"{log_id} No LLM config, skipping enrichment")
         return {"status": "success", "enriched_metrics": filtered_metrics}
+    model, api_base, api_key = llm
 
     # Build a compact list of unique product names per search term
     # Only flyer items — ecom items are just for baseline, they don't need enrichment
@@ -521,19 +512,11 @@ async def select_walmart_baselines(
     """
     log_id = "[ShopperTools:select_walmart_baselines]"
 
-    cfg = tool_config or {}
-    raw_model = (
-        cfg.get("model")
-        or cfg.get("model_name")
-        or os.getenv("LLM_SERVICE_GENERAL_MODEL_NAME", "gpt-4o")
-    )
-    model = raw_model.split("/", 1)[-1] if "/" in raw_model else raw_model
-    api_base = (cfg.get("api_base") or cfg.get("endpoint", "")).rstrip("/")
-    api_key = cfg.get("api_key", "")
-
-    if not api_base or not api_key:
+    llm = _llm_settings(tool_config)
+    if llm is None:
         log.warning(f"{log_id} No LLM config, skipping baseline selection")
         return {"status": "success", "walmart_baselines": {}}
+    model, api_base, api_key = llm
 
     # Build Walmart ecom candidates per search term
     candidates_by_term = {}
@@ -1015,9 +998,10 @@ def format_shopping_plan(
 
     for item in plan_items:
         search_term = item.get("search_term", "")
+        display_term = search_term.title()
         store = item.get("store", "")
         price = item.get("price", "N/A")
-        product = item.get("product", search_term.title())
+        product = item.get("product", display_term)
 
         # Match image only if the LLM's chosen product matches the cached deal.
         # Each image is tied to a specific flyer_item_id — using the wrong one
@@ -1031,7 +1015,7 @@ def format_shopping_plan(
                 image_url = cached["image_url"]
 
         img = f"![flyer]({image_url})" if image_url else ""
-        lines.append(f"| {img} | {search_term.title()} | {store} | {price} | {product} |")
+        lines.append(f"| {img} | {display_term} | {store} | {price} | {product} |")
 
     lines.append("")
 
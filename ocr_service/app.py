@@ -1,5 +1,6 @@
 """OCR microservice – extracts text from flyer images using Tesseract."""
 
+import asyncio
 import io
 import logging
 
@@ -48,6 +49,30 @@ def _preprocess_variants(img: Image.Image):
     yield img, 4
 
 
+def _prepare_variants(content: bytes) -> list:
+    """Decode, upscale and preprocess an image into (image, psm) OCR variants."""
+    img = Image.open(io.BytesIO(content))
+
+    # Preprocess for better OCR on small flyer images
+    # 1. Upscale small images (flyer crops are often tiny)
+    MIN_WIDTH = 1000
+    if img.width < MIN_WIDTH:
+        scale = MIN_WIDTH / img.width
+        img = img.resize(
+            (int(img.width * scale), int(img.height * scale)),
+            Image.LANCZOS,
+        )
+
+    return list(_preprocess_variants(img))
+
+
+def _ocr_variant(prep_img: Image.Image, psm: int) -> str:
+    try:
+        return pytesseract.image_to_string(prep_img, config=f"--psm {psm}").strip()
+    except Exception:
+        return ""
+
+
 class ExtractRequest(BaseModel):
     image_url: str
 
@@ -65,31 +90,23 @@ async def extract_text(body: ExtractRequest):
             resp = await client.get(body.image_url)
             resp.raise_for_status()
 
-        img = Image.open(io.BytesIO(resp.content))
-
-        # Preprocess for better OCR on small flyer images
-        # 1. Upscale small images (flyer crops are often tiny)
-        MIN_WIDTH = 1000
-        if img.width < MIN_WIDTH:
-            scale = MIN_WIDTH / img.width
-            img = img.resize(
-                (int(img.width * scale), int(img.height * scale)),
-                Image.LANCZOS,
-            )
-
-        # 2. Try multiple preprocessing strategies, combine all results
-        #    The caller (grocery_tools.py) runs regex over the text to find
-        #    weight patterns like "675g", so combining gives the best chance.
+        # Image decoding/preprocessing is CPU-bound, keep it off the event loop
+        variants = await asyncio.to_thread(_prepare_variants, resp.content)
+
+        # Try multiple preprocessing strategies, combine all results.
+        # The caller (grocery_tools.py) runs regex over the text to find
+        # weight patterns like "675g", so combining gives the best chance.
+        # Each variant is a separate tesseract process, so they run in
+        # parallel from worker threads; gather keeps the variant order.
+        texts = await asyncio.gather(
+            *(asyncio.to_thread(_ocr_variant, prep_img, psm) for prep_img, psm in variants)
+        )
         seen = set()
         parts = []
-        for prep_img, psm in _preprocess_variants(img):
-            try:
-                t = pytesseract.image_to_string(prep_img, config=f"--psm {psm}").strip()
-                if t and t not in seen:
-                    seen.add(t)
-                    parts.append(t)
-            except Exception:
-                pass
+        for t in texts:
+            if t and t not in seen:
+                seen.add(t)
+                parts.append(t)
 
         text = "\n".join(parts)
         return {"status": "success", "text": text}